@@ -0,0 +1,174 @@
+from typing import Callable, Dict, List
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SIZES = (1_000, 100_000, 1_000_000)
+STARTUP_SIZE = 1_000
+WIDTH, HEIGHT = 1000, 700
+FIRST_FRAME_RE = re.compile(r"time to first frame: ([\d.]+) ms")
+
+
+def timed(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "repeat": repeat,
+    }
+
+
+def synthetic_series(size: int):
+    from health_control_chackra.chart import time_series
+
+    start = datetime.date(2000, 1, 1).toordinal()
+    # Una oscilación lenta con ruido determinista: suficiente para que el diezmado trabaje
+    return time_series.TimeSeries(
+        range(start, start + size),
+        (70 + 5 * ((i * 7919) % 1000) / 1000 + (i % 365) / 73 for i in range(size)),
+    )
+
+
+def write_csv(path: pathlib.Path, size: int) -> None:
+    start = datetime.date(2000, 1, 1)
+    with open(path, "w") as f:
+        f.write("date,weight\n")
+        for i in range(size):
+            f.write(f"{start + datetime.timedelta(days=i)},{70 + (i % 100) / 10}\n")
+
+
+def bench_draw(sizes: List[int], repeat: int) -> List[dict]:
+    import cairo
+    import gi  # type: ignore
+    gi.require_version("Gtk", "4.0")
+    from gi.repository import Gtk  # noqa: E402
+    from health_control_chackra.chart import time_series_chart
+
+    Gtk.init()
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+    results = []
+    for size in sizes:
+        widget = time_series_chart.TimeSeriesChartWidget(
+            data=synthetic_series(size),
+            config=time_series_chart.ChartConfig(title="Benchmark", y_label="Peso (kg)"),
+        )
+
+        def draw_cold() -> None:
+            widget.geometry.invalidate_data()
+            widget.static_layer.invalidate()
+            widget.on_draw(None, cairo.Context(surface), WIDTH, HEIGHT)
+
+        def draw_warm() -> None:
+            widget.on_draw(None, cairo.Context(surface), WIDTH, HEIGHT)
+
+        results.append({"name": "chart.on_draw", "phase": "cold", "points": size, **timed(draw_cold, repeat)})
+        results.append({"name": "chart.on_draw", "phase": "warm", "points": size, **timed(draw_warm, repeat)})
+    return results
+
+
+def bench_repository(sizes: List[int], repeat: int, directory: pathlib.Path) -> List[dict]:
+    from health_control_chackra.domain import weight_repository
+
+    results = []
+    for size in sizes:
+        path = directory / f"weights_{size}.csv"
+        write_csv(path, size)
+        plain = weight_repository.FileCsvWeightRepository(path, use_cache=False)
+        cached = weight_repository.FileCsvWeightRepository(path)
+
+        def stream() -> None:
+            for _ in plain.iter_chunks():
+                pass
+
+        def read_cold() -> None:
+            cached.cache.invalidate()
+            cached.read_columns()
+
+        results.append({"name": "csv.get_all", "points": size, **timed(plain.get_all, repeat)})
+        results.append({"name": "csv.iter_chunks", "points": size, **timed(stream, repeat)})
+        results.append({"name": "csv.read_columns", "phase": "cold", "points": size, **timed(read_cold, repeat)})
+        results.append({"name": "csv.map_columns", "phase": "warm", "points": size, **timed(cached.map_columns, repeat)})
+    return results
+
+
+def bench_startup(repeat: int, directory: pathlib.Path) -> List[dict]:
+    # Configuración y datos propios: la medición no toca los del usuario ni depende de ellos
+    csv_path = directory / "startup.csv"
+    write_csv(csv_path, STARTUP_SIZE)
+    config_path = directory / "configuration.json"
+    config_path.write_text(json.dumps({"file_csv": str(csv_path)}))
+    samples, wall = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-m", "health_control_chackra", "--profile-startup", "--config", str(config_path)],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        wall.append((time.perf_counter() - start) * 1000)
+        match = FIRST_FRAME_RE.search(process.stderr)
+        if match is None:
+            return [{"name": "app.first_frame", "error": process.stderr.strip()[-500:]}]
+        samples.append(float(match.group(1)))
+    return [{
+        "name": "app.first_frame",
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "process_median_ms": round(statistics.median(wall), 3),
+        "repeat": repeat,
+    }]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the chart, the repositories and startup")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", choices=["draw", "repository", "startup"], nargs="+")
+    parser.add_argument("--output", type=pathlib.Path, help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    suites = set(args.only or ["draw", "repository", "startup"])
+
+    results: List[dict] = []
+    if "repository" in suites:
+        with tempfile.TemporaryDirectory() as directory:
+            results += bench_repository(args.sizes, args.repeat, pathlib.Path(directory))
+    if "draw" in suites:
+        results += bench_draw(args.sizes, args.repeat)
+    if "startup" in suites:
+        with tempfile.TemporaryDirectory() as directory:
+            results += bench_startup(args.repeat, pathlib.Path(directory))
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "gdk_backend": os.environ.get("GDK_BACKEND"),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
+import argparse
 import pathlib
-import gi
-gi.require_version("Adw", "1")
-from gi.repository import Adw    # type: ignore
-from health_control_chackra.ui import main_window
+import sys
+from health_control_chackra import startup
+with startup.profile.measure("import gi, Adw"):
+    import gi
+    gi.require_version("Adw", "1")
+    from gi.repository import Adw    # type: ignore
+    from gi.repository import Gio    # type: ignore
+    from gi.repository import GLib    # type: ignore
 from health_control_chackra.domain import configuration_repository
 
 
@@ -10,31 +15,70 @@ _JSON_CONFIGURATION = __file__.replace("__main__.py", "configuration.json")
 
 
 class Application(Adw.Application):
-    def __init__(self):
+    def __init__(self, profile_startup: bool = False, config_path: pathlib.Path = pathlib.Path(_JSON_CONFIGURATION)):
         super().__init__(application_id="com.chackra.health_control")
-        self.config_repo = configuration_repository.FileJSONConfigurationRepository(
-            pathlib.Path(_JSON_CONFIGURATION)
-        )
+        if profile_startup:
+            # Al medir no se entrega la activación a una instancia que ya esté abierta
+            self.set_flags(Gio.ApplicationFlags.NON_UNIQUE)
+        self.profile_startup = profile_startup
+        self.config_repo = configuration_repository.FileJSONConfigurationRepository(config_path)
 
     def do_activate(self):
         win = self.props.active_window
         if not win:
+            startup.profile.mark("activate")
+            # La ventana (y con ella Gtk, Pango y la gráfica) se importa al activarse, no al cargar el módulo
+            with startup.profile.measure("import ui.main_window"):
+                from health_control_chackra.ui import main_window
             if not self.config_repo.exists():
                 self.config_repo.create_default()
             config = self.config_repo.get_all()
             win = main_window.MainWindow(
                 app=self,
-                json_path=_JSON_CONFIGURATION,
+                json_path=self.config_repo.file_path,
                 configuration=config
             )
+            startup.profile.mark("window created")
+            if self.profile_startup:
+                win.connect("map", self.on_first_map)
         win.present()
 
+    def on_first_map(self, win):
+        clock = win.get_frame_clock()
+
+        def on_after_paint(_clock):
+            clock.disconnect(handler_id)
+            startup.profile.mark(startup.FIRST_FRAME)
+            GLib.idle_add(self.quit)
+
+        handler_id = clock.connect("after-paint", on_after_paint)
+
 
 def main():
+    parser = argparse.ArgumentParser(prog="health_control_chackra")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report import and first-frame timings, then exit",
+    )
+    parser.add_argument(
+        "--config",
+        type=pathlib.Path,
+        default=pathlib.Path(_JSON_CONFIGURATION),
+        help="configuration file to use instead of the one next to the package",
+    )
+    args, _ = parser.parse_known_args()
+
     Adw.init()
-    app = Application()
-    app.run(None)
+    startup.profile.mark("Adw.init")
+    app = Application(profile_startup=args.profile_startup, config_path=args.config)
+    status = app.run(None)
+
+    if args.profile_startup:
+        print(startup.profile.report(), file=sys.stderr)
+        return 0 if startup.profile.within_budget() else 1
+    return status
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
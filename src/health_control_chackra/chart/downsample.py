@@ -0,0 +1,89 @@
+from typing import List, Sequence, Tuple
+import math
+
+
+POINTS = Tuple[List[float], List[float]]
+MINMAX = "minmax"
+LTTB = "lttb"
+
+
+def min_max_indices(xs: Sequence[float], ys: Sequence[float]) -> List[int]:
+    n = len(xs)
+    if n <= 2:
+        return list(range(n))
+
+    # Las X proyectadas están ordenadas, así que cada columna de píxel es contigua
+    selected = {0, n - 1}
+    column = math.floor(xs[0])
+    low = high = 0
+    for i in range(1, n):
+        current = math.floor(xs[i])
+        if current != column:
+            selected.add(low)
+            selected.add(high)
+            column, low, high = current, i, i
+            continue
+        if ys[i] < ys[low]:
+            low = i
+        if ys[i] >= ys[high]:
+            high = i
+    selected.add(low)
+    selected.add(high)
+    return sorted(selected)
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        count = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / count
+        avg_y = sum(ys[avg_start:avg_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        selected.append(next_a)
+        a = next_a
+    selected.append(n - 1)
+    return selected
+
+
+def downsample(xs: Sequence[float], ys: Sequence[float], plot_width: int, method: str = MINMAX) -> POINTS:
+    target = max(2 * plot_width, 3)
+    if len(xs) <= target:
+        return list(xs), list(ys)
+    if method == LTTB:
+        indices = lttb_indices(xs, ys, target)
+    elif method == MINMAX:
+        indices = min_max_indices(xs, ys)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return [xs[i] for i in indices], [ys[i] for i in indices]
+
+
+def marker_step(count: int, plot_width: int, min_spacing: float = 8, hide_below: float = 2) -> int:
+    if count <= 1:
+        return 1
+    if plot_width <= 0:
+        return 0
+    spacing = plot_width / count
+    if spacing >= min_spacing:
+        return 1
+    if spacing < hide_below:
+        return 0
+    return math.ceil(min_spacing / spacing)
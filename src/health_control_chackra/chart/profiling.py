@@ -0,0 +1,94 @@
+from typing import Callable, Deque, Dict, List
+import collections
+import json
+import logging
+import time
+
+
+FRAME_PHASES = ("grid", "labels", "line", "markers", "overlays", "title", "tooltip")
+HISTORY_SIZE = 120
+
+FrameTimings = Dict[str, float]
+
+logger = logging.getLogger(__name__)
+
+
+def log_frame(frame: FrameTimings) -> None:
+    logger.debug("chart.frame %s", json.dumps(frame, sort_keys=True))
+
+
+class FrameProfiler:
+    def __init__(self, history_size: int = HISTORY_SIZE) -> None:
+        self.overlay_visible = False
+        self.frames: Deque[FrameTimings] = collections.deque(maxlen=history_size)
+        self.events: Dict[str, float] = {}
+        self.listeners: List[Callable[[FrameTimings], None]] = []
+        self._current: FrameTimings = {}
+        self._frame_start = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.overlay_visible or bool(self.listeners)
+
+    def add_listener(self, listener: Callable[[FrameTimings], None]) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[FrameTimings], None]) -> None:
+        self.listeners.remove(listener)
+
+    def toggle_overlay(self) -> bool:
+        self.overlay_visible = not self.overlay_visible
+        return self.overlay_visible
+
+    # Desactivado, cada medición se queda en una comprobación y devuelve 0 sin leer el reloj
+    def start(self) -> float:
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, phase: str, start: float) -> float:
+        if not start:
+            return 0.0
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - start) * 1000
+        return now
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._current = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not self._frame_start:
+            return
+        frame = self._current
+        frame["total"] = (time.perf_counter() - self._frame_start) * 1000
+        self._frame_start = 0.0
+        self.frames.append(frame)
+        for listener in self.listeners:
+            listener(frame)
+
+    def record_since(self, name: str, start: float) -> None:
+        if start:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, milliseconds: float) -> None:
+        # Mediciones fuera del dibujo (hit-test, carga de datos) que no pertenecen a un frame
+        self.events[name] = milliseconds
+
+    def averages(self) -> FrameTimings:
+        totals: FrameTimings = collections.defaultdict(float)
+        for frame in self.frames:
+            for phase, value in frame.items():
+                totals[phase] += value
+        count = len(self.frames) or 1
+        return {phase: value / count for phase, value in totals.items()}
+
+    def summary_lines(self) -> List[str]:
+        last = self.frames[-1] if self.frames else {}
+        averages = self.averages()
+        lines = [f"{'fase':<10}{'último':>9}{'media':>9}"]
+        for phase in ("layer", *FRAME_PHASES, "total"):
+            if phase in averages:
+                lines.append(f"{phase:<10}{last.get(phase, 0.0):>7.2f}ms{averages[phase]:>7.2f}ms")
+        for name, value in sorted(self.events.items()):
+            lines.append(f"{name:<10}{value:>7.2f}ms")
+        return lines
@@ -0,0 +1,135 @@
+from typing import Callable, List, Sequence, Tuple
+import array
+import bisect
+import datetime
+
+from health_control_chackra.chart.time_series import numpy_module
+
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+
+def day_bucket(ordinal: int) -> int:
+    return ordinal
+
+
+def week_bucket(ordinal: int) -> int:
+    # El ordinal 1 (0001-01-01) es lunes: las semanas empiezan en lunes
+    return ordinal - (ordinal - 1) % 7
+
+
+def month_bucket(ordinal: int) -> int:
+    return datetime.date.fromordinal(ordinal).replace(day=1).toordinal()
+
+
+class AggregateLevel:
+    def __init__(self, name: str, bucket: Callable[[int], int], center: float) -> None:
+        self.name = name
+        self.bucket = bucket
+        # Desplazamiento desde el inicio del cubo hasta el punto donde se dibuja
+        self.center = center
+        self.keys = array.array('i')
+        self.counts = array.array('i')
+        self.sums = array.array('d')
+        self.lows = array.array('d')
+        self.highs = array.array('d')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, ordinal: int, count: int, total: float, low: float, high: float) -> None:
+        key = self.bucket(ordinal)
+        keys = self.keys
+        if keys and keys[-1] == key:
+            index = len(keys) - 1
+        elif not keys or keys[-1] < key:
+            # Caso habitual: los datos llegan en orden y el cubo nuevo va al final
+            self._insert(len(keys), key, count, total, low, high)
+            return
+        else:
+            index = bisect.bisect_left(keys, key)
+            if keys[index] != key:
+                self._insert(index, key, count, total, low, high)
+                return
+
+        self.counts[index] += count
+        self.sums[index] += total
+        self.lows[index] = min(self.lows[index], low)
+        self.highs[index] = max(self.highs[index], high)
+
+    def _insert(self, index: int, key: int, count: int, total: float, low: float, high: float) -> None:
+        self.keys.insert(index, key)
+        self.counts.insert(index, count)
+        self.sums.insert(index, total)
+        self.lows.insert(index, low)
+        self.highs.insert(index, high)
+
+    def window(self, start: int, end: int) -> range:
+        # Un cubo más a cada lado, igual que con los puntos crudos, para llegar hasta los bordes
+        return range(
+            max(bisect.bisect_left(self.keys, start) - 1, 0),
+            min(bisect.bisect_right(self.keys, end) + 1, len(self.keys)),
+        )
+
+    def centers(self, window: range) -> List[float]:
+        return [key + self.center for key in self.keys[window.start:window.stop]]
+
+    def means(self, window: range) -> List[float]:
+        return [
+            total / count
+            for total, count in zip(self.sums[window.start:window.stop], self.counts[window.start:window.stop])
+        ]
+
+
+class AggregatePyramid:
+    def __init__(self) -> None:
+        self.levels: Tuple[AggregateLevel, ...] = (
+            AggregateLevel(DAY, day_bucket, 0.0),
+            AggregateLevel(WEEK, week_bucket, 3.0),
+            AggregateLevel(MONTH, month_bucket, 14.5),
+        )
+
+    @classmethod
+    def from_columns(cls, ordinals: Sequence[int], values: Sequence[float]) -> "AggregatePyramid":
+        pyramid = cls()
+        daily = pyramid.levels[0]
+        np = numpy_module()
+        if np is not None and len(ordinals):
+            days = np.asarray(ordinals, dtype=np.int32)
+            weights = np.asarray(values, dtype=np.float64)
+            # La serie está ordenada: cada día es un tramo contiguo que reduceat agrega de una vez
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+            daily.keys = array.array('i', days[starts].tobytes())
+            daily.counts = array.array('i', np.diff(np.append(starts, len(days))).astype(np.int32).tobytes())
+            daily.sums = array.array('d', np.add.reduceat(weights, starts).tobytes())
+            daily.lows = array.array('d', np.minimum.reduceat(weights, starts).tobytes())
+            daily.highs = array.array('d', np.maximum.reduceat(weights, starts).tobytes())
+        else:
+            for ordinal, value in zip(ordinals, values):
+                daily.add(ordinal, 1, value, value, value)
+
+        # Los niveles gruesos se construyen desde los días, no desde los datos crudos
+        for level in pyramid.levels[1:]:
+            for row in zip(daily.keys, daily.counts, daily.sums, daily.lows, daily.highs):
+                level.add(*row)
+        return pyramid
+
+    def add(self, ordinal: int, value: float) -> None:
+        for level in self.levels:
+            level.add(ordinal, 1, value, value, value)
+
+    def extend(self, ordinals: Sequence[int], values: Sequence[float]) -> None:
+        for ordinal, value in zip(ordinals, values):
+            self.add(ordinal, value)
+
+    def level(self, name: str) -> AggregateLevel:
+        return next(level for level in self.levels if level.name == name)
+
+    def level_for(self, start: int, end: int, pixels: int) -> AggregateLevel | None:
+        # El nivel más grueso que todavía tiene al menos un cubo por píxel
+        for level in reversed(self.levels):
+            if len(level.window(start, end)) >= pixels:
+                return level
+        return None
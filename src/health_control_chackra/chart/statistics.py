@@ -0,0 +1,106 @@
+from typing import Deque, Sequence, Tuple
+import array
+import collections
+import itertools
+
+from health_control_chackra.chart.time_series import numpy_module
+
+
+SMA = "sma"
+EMA = "ema"
+TREND = "trend"
+SMA_WINDOW = 7
+EMA_SPAN = 7
+
+
+class RollingStatistics:
+    def __init__(self, window: int = SMA_WINDOW, span: int = EMA_SPAN) -> None:
+        self.window = window
+        self.alpha = 2 / (span + 1)
+        self.sma = array.array('d')
+        self.ema = array.array('d')
+        self._recent: Deque[float] = collections.deque(maxlen=window)
+        self._window_sum = 0.0
+        # La regresión usa días desde el primer dato: con ordinales absolutos (~7e5) las sumas
+        # de cuadrados pierden precisión enseguida
+        self._origin = 0
+        self._n = 0
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xx = 0.0
+        self._sum_xy = 0.0
+
+    def __len__(self) -> int:
+        return len(self.sma)
+
+    @classmethod
+    def from_columns(
+            cls,
+            ordinals: Sequence[int],
+            values: Sequence[float],
+            window: int = SMA_WINDOW,
+            span: int = EMA_SPAN
+    ) -> "RollingStatistics":
+        stats = cls(window, span)
+        np = numpy_module()
+        if np is None or not len(ordinals):
+            stats.extend(ordinals, values)
+            return stats
+
+        n = len(ordinals)
+        xs = np.asarray(ordinals, dtype=np.float64) - ordinals[0]
+        ys = np.asarray(values, dtype=np.float64)
+        # Media móvil con sumas acumuladas: los primeros puntos promedian lo que haya disponible
+        cumulative = np.concatenate(([0.0], np.cumsum(ys)))
+        ends = np.arange(1, n + 1)
+        starts = np.maximum(ends - window, 0)
+        stats.sma = array.array('d', ((cumulative[ends] - cumulative[starts]) / (ends - starts)).tobytes())
+        alpha = stats.alpha
+        stats.ema = array.array('d', itertools.accumulate(values, lambda current, value: current + alpha * (value - current)))
+
+        stats._recent.extend(values[max(n - window, 0):])
+        stats._window_sum = sum(stats._recent)
+        stats._origin = ordinals[0]
+        stats._n = n
+        stats._sum_x = float(xs.sum())
+        stats._sum_y = float(ys.sum())
+        stats._sum_xx = float(xs @ xs)
+        stats._sum_xy = float(xs @ ys)
+        return stats
+
+    def extend(self, ordinals: Sequence[int], values: Sequence[float]) -> None:
+        for ordinal, value in zip(ordinals, values):
+            self.append(ordinal, value)
+
+    def append(self, ordinal: int, value: float) -> None:
+        if len(self._recent) == self.window:
+            self._window_sum -= self._recent[0]
+        self._recent.append(value)
+        self._window_sum += value
+        self.sma.append(self._window_sum / len(self._recent))
+        self.ema.append(self.ema[-1] + self.alpha * (value - self.ema[-1]) if self.ema else value)
+
+        if not self._n:
+            self._origin = ordinal
+        x = ordinal - self._origin
+        self._n += 1
+        self._sum_x += x
+        self._sum_y += value
+        self._sum_xx += x * x
+        self._sum_xy += x * value
+
+    def trend(self) -> Tuple[float, float] | None:
+        # Pendiente por día y ordenada en el primer dato, por mínimos cuadrados
+        n = self._n
+        denominator = n * self._sum_xx - self._sum_x ** 2
+        if n < 2 or not denominator:
+            return None
+        slope = (n * self._sum_xy - self._sum_x * self._sum_y) / denominator
+        return slope, (self._sum_y - slope * self._sum_x) / n
+
+    def trend_at(self, ordinal: float) -> float | None:
+        trend = self.trend()
+        if trend is None:
+            return None
+        slope, intercept = trend
+        return intercept + slope * (ordinal - self._origin)
@@ -0,0 +1,198 @@
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple, overload
+import array
+import bisect
+import dataclasses
+import datetime
+import functools
+import logging
+
+from health_control_chackra.domain.weight_cache import (
+    ORDINAL_TYPECODE,
+    VALUE_TYPECODE,
+    FloatColumn,
+    IntColumn,
+    is_sorted,
+    sort_columns,
+)
+
+
+DATE_FORMAT = "%Y-%m-%d"
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def numpy_module() -> Any:
+    # NumPy tarda en importarse: se carga al proyectar por primera vez, no al arrancar
+    try:
+        import numpy  # type: ignore
+    except ImportError:  # no cov
+        return None
+    return numpy
+
+
+@dataclasses.dataclass
+class TimeSeriesEntry:
+    date: datetime.date
+    value: float
+
+    @classmethod
+    def from_str(cls, date_str: str | datetime.date, value: float) -> Optional["TimeSeriesEntry"]:
+        try:
+            if isinstance(date_str, datetime.date):
+                return cls(date=date_str, value=float(value))
+            date = datetime.datetime.strptime(date_str, DATE_FORMAT).date()
+            return cls(date=date, value=float(value))
+        except Exception as e:
+            logger.exception(f"Error parsing date {date_str}: {e}")
+            return None
+
+
+def _owned_array(typecode: str, data: Sequence) -> array.array:
+    owned = array.array(typecode)
+    if isinstance(data, memoryview):
+        owned.frombytes(data.cast("B"))
+    else:
+        owned.extend(data)
+    return owned
+
+
+class TimeSeries:
+    __slots__ = ("ordinals", "values")
+    ordinals: IntColumn
+    values: FloatColumn
+
+    def __init__(self, ordinals: Iterable[int] = (), values: Iterable[float] = ()) -> None:
+        self.ordinals = array.array(ORDINAL_TYPECODE, ordinals)
+        self.values = array.array(VALUE_TYPECODE, values)
+        if len(self.ordinals) != len(self.values):
+            raise ValueError("ordinals and values must have the same length")
+
+    @classmethod
+    def from_buffers(cls, ordinals: IntColumn, values: FloatColumn) -> "TimeSeries":
+        # Comparte la memoria de las vistas (p. ej. un mmap) sin copiar ni crear objetos por fila
+        if len(ordinals) != len(values):
+            raise ValueError("ordinals and values must have the same length")
+        series = cls.__new__(cls)
+        series.ordinals = ordinals
+        series.values = values
+        return series
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[datetime.date, float]]) -> "TimeSeries":
+        series = cls()
+        series.extend(records)
+        series.sort()
+        return series
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TimeSeriesEntry]) -> "TimeSeries":
+        return cls.from_records((entry.date, entry.value) for entry in entries)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __bool__(self) -> bool:
+        return len(self.ordinals) > 0
+
+    @overload
+    def __getitem__(self, index: int) -> TimeSeriesEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TimeSeries": ...
+
+    def __getitem__(self, index: int | slice) -> "TimeSeriesEntry | TimeSeries":
+        if isinstance(index, slice):
+            return TimeSeries(self.ordinals[index], self.values[index])
+        return TimeSeriesEntry(
+            date=datetime.date.fromordinal(self.ordinals[index]),
+            value=self.values[index],
+        )
+
+    def __iter__(self) -> Iterator[TimeSeriesEntry]:
+        for ordinal, value in zip(self.ordinals, self.values):
+            yield TimeSeriesEntry(date=datetime.date.fromordinal(ordinal), value=value)
+
+    def __repr__(self) -> str:
+        return f"TimeSeries(len={len(self)})"
+
+    @property
+    def date_min(self) -> datetime.date:
+        return datetime.date.fromordinal(self.ordinals[0])
+
+    @property
+    def date_max(self) -> datetime.date:
+        return datetime.date.fromordinal(self.ordinals[-1])
+
+    @property
+    def is_shared(self) -> bool:
+        return not isinstance(self.ordinals, array.array) or not isinstance(self.values, array.array)
+
+    def _ensure_owned(self) -> Tuple["array.array[int]", "array.array[float]"]:
+        ordinals, values = self.ordinals, self.values
+        if not isinstance(ordinals, array.array) or not isinstance(values, array.array):
+            ordinals = self.ordinals = _owned_array(ORDINAL_TYPECODE, ordinals)
+            values = self.values = _owned_array(VALUE_TYPECODE, values)
+        return ordinals, values
+
+    def copy(self) -> "TimeSeries":
+        return TimeSeries(self.ordinals, self.values)
+
+    def append(self, date: datetime.date, value: float) -> None:
+        ordinals, values = self._ensure_owned()
+        ordinals.append(date.toordinal())
+        values.append(float(value))
+
+    def extend(self, records: Iterable[Tuple[datetime.date, float]]) -> None:
+        ordinals, values = self._ensure_owned()
+        for date, value in records:
+            ordinals.append(date.toordinal())
+            values.append(float(value))
+
+    def is_sorted(self) -> bool:
+        return is_sorted(self.ordinals)
+
+    def sort(self) -> None:
+        if self.is_sorted():
+            return
+        self.ordinals, self.values = sort_columns(self.ordinals, self.values)
+
+    def insert(self, date: datetime.date, value: float) -> int:
+        ordinals, values = self._ensure_owned()
+        ordinal = date.toordinal()
+        index = bisect.bisect_right(ordinals, ordinal)
+        ordinals.insert(index, ordinal)
+        values.insert(index, float(value))
+        return index
+
+    def merge(self, other: "TimeSeries") -> None:
+        if not other:
+            return
+        if not self and other.is_shared:
+            # Las vistas son de solo lectura, así que se pueden compartir sin copiarlas
+            self.ordinals, self.values = other.ordinals, other.values
+            return
+        if not self or self.ordinals[-1] <= other.ordinals[0]:
+            ordinals, values = self._ensure_owned()
+            ordinals.extend(other.ordinals)
+            values.extend(other.values)
+            return
+
+        ordinals = array.array(ORDINAL_TYPECODE)
+        values = array.array(VALUE_TYPECODE)
+        i = j = 0
+        n, m = len(self), len(other)
+        while i < n and j < m:
+            if other.ordinals[j] < self.ordinals[i]:
+                ordinals.append(other.ordinals[j])
+                values.append(other.values[j])
+                j += 1
+            else:
+                ordinals.append(self.ordinals[i])
+                values.append(self.values[i])
+                i += 1
+        ordinals.extend(self.ordinals[i:])
+        values.extend(self.values[i:])
+        ordinals.extend(other.ordinals[j:])
+        values.extend(other.values[j:])
+        self.ordinals = ordinals
+        self.values = values
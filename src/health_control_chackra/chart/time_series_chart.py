@@ -1,7 +1,13 @@
-from typing import List, Callable, Tuple, Any, Optional
+from typing import Dict, List, Callable, Iterable, Tuple, Any, Sequence
+import array
+import bisect
+import collections
 import datetime
+import functools
+import math
 import dataclasses
 import logging
+import cairo
 import gi  # type: ignore
 gi.require_version('Gtk', '4.0')
 gi.require_version('Pango', '1.0')
@@ -10,11 +16,21 @@ from gi.repository import Gtk  # noqa: E402
 from gi.repository import GObject  # noqa: E402
 from gi.repository import Pango  # noqa: E402
 from gi.repository import PangoCairo  # noqa: E402
+from health_control_chackra.chart.time_series import DATE_FORMAT, TimeSeries, TimeSeriesEntry, numpy_module  # noqa: E402, F401
+from health_control_chackra.chart import downsample, profiling, pyramid, statistics  # noqa: E402
 
 
 COLOR_TYPE_RGB = Tuple[float, float, float]
 COLOR_TYPE_ARGB = Tuple[float, float, float, float]
-DATE_FORMAT = "%Y-%m-%d"
+PROJECTED_POINTS = Tuple[List[float], List[float]]
+PROJECTED_AGGREGATES = Tuple[List[float], List[float], List[float], List[float]]
+HOVER_RADIUS = 15
+CHART_MARGINS = (100, 80, 60, 80)
+LAYOUT_CACHE_SIZE = 128
+DEBUG_OVERLAY_SHORTCUT = "F12"
+RESET_VIEWPORT_SHORTCUT = "Home"
+ZOOM_STEP = 1.25
+MIN_VIEWPORT_DAYS = 7
 
 logger = logging.getLogger(__name__)
 
@@ -52,37 +68,83 @@ def map_date_to_x_coordinate(
     return margin_left + (days_elapsed / days_total) * plot_width
 
 
-def create_layout(cr: Any, text: str, size: int, bold=False) -> Pango.Layout:
-    layout = PangoCairo.create_layout(cr)
+@functools.lru_cache(maxsize=None)
+def font_description(size: int, bold: bool = False) -> Pango.FontDescription:
     font_desc = Pango.FontDescription()
     font_desc.set_family("Sans")
     font_desc.set_size(size * Pango.SCALE)
     if bold:
         font_desc.set_weight(Pango.Weight.BOLD)
-    layout.set_font_description(font_desc)
+    return font_desc
+
+
+def create_layout(cr: Any, text: str, size: int, bold=False) -> Pango.Layout:
+    layout = PangoCairo.create_layout(cr)
+    layout.set_font_description(font_description(size, bold))
     layout.set_text(text, -1)
     return layout
 
 
+class LayoutCache:
+    def __init__(self, max_size: int = LAYOUT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._layouts: collections.OrderedDict[Tuple[str, int, bool], Pango.Layout] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def clear(self) -> None:
+        self._layouts.clear()
+
+    def get(self, cr: Any, text: str, size: int, bold: bool = False) -> Pango.Layout:
+        key = (text, size, bold)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            # Solo vuelve a maquetar si cambió la transformación u opciones de fuente del contexto
+            PangoCairo.update_layout(cr, layout)
+            return layout
+
+        layout = create_layout(cr, text, size, bold)
+        self._layouts[key] = layout
+        if len(self._layouts) > self.max_size:
+            self._layouts.popitem(last=False)
+        return layout
+
+
 def value_to_y(value: float, margin_top: float, plot_height: float, min_val: float, max_val: float) -> float:
     return margin_top + plot_height - ((value - (min_val - 1)) / ((max_val + 1) - (min_val - 1))) * plot_height
 
 
-@dataclasses.dataclass
-class TimeSeriesEntry:
-    date: datetime.date
-    value: float
+def project_series(series: TimeSeries, area: "PlotArea", extents: "DataExtents") -> PROJECTED_POINTS:
+    return project_columns(series.ordinals, series.values, area, extents)
 
-    @classmethod
-    def from_str(cls, date_str: str | datetime.date, value: float) -> Optional["TimeSeriesEntry"]:
-        try:
-            if isinstance(date_str, datetime.date):
-                return cls(date=date_str, value=float(value))
-            date = datetime.datetime.strptime(date_str, DATE_FORMAT).date()
-            return cls(date=date, value=float(value))
-        except Exception as e:
-            logger.exception(f"Error parsing date {date_str}: {e}")
-            return None
+
+def project_columns(
+        ordinals: Sequence[float],
+        values: Sequence[float],
+        area: "PlotArea",
+        extents: "DataExtents"
+) -> PROJECTED_POINTS:
+    if not len(ordinals):
+        return [], []
+    ordinal_min = extents.date_min.toordinal()
+    days_total = (extents.date_max.toordinal() - ordinal_min) or 1
+    value_low = extents.min_val - 1
+    value_span = (extents.max_val + 1) - value_low
+    margin_left, margin_top = area.margin_left, area.margin_top
+    plot_width, plot_height = area.width, area.height
+
+    np = numpy_module()
+    if np is not None:
+        xs = margin_left + ((np.asarray(ordinals) - ordinal_min) / days_total) * plot_width
+        ys = margin_top + plot_height - ((np.asarray(values, dtype=np.float64) - value_low) / value_span) * plot_height
+        return xs.tolist(), ys.tolist()
+
+    return (
+        [margin_left + ((o - ordinal_min) / days_total) * plot_width for o in ordinals],
+        [margin_top + plot_height - ((v - value_low) / value_span) * plot_height for v in values],
+    )
 
 
 @dataclasses.dataclass
@@ -132,32 +194,537 @@ class ChartConfig:
     y_format: str = "{:.1f}"
     line_color: Tuple[float, float, float] = (0.2, 0.5, 0.8)
     tooltip_formatter: Callable[[datetime.date, float], str] | None = None
+    downsampling: str | None = downsample.MINMAX
+    aggregate: bool = True
+    overlays: Tuple[str, ...] = (statistics.SMA, statistics.EMA, statistics.TREND)
+    overlay_colors: Dict[str, COLOR_TYPE_RGB] = dataclasses.field(default_factory=lambda: {
+        statistics.SMA: (0.95, 0.55, 0.15),
+        statistics.EMA: (0.35, 0.75, 0.35),
+        statistics.TREND: (0.8, 0.3, 0.6),
+    })
 
     def __post_init__(self) -> None:
         if self.tooltip_formatter is None:
             self.tooltip_formatter = lambda d, v: f"{d.strftime(DATE_FORMAT)}\n{self.y_label}: {self.y_format.format(v)}"
 
 
+@dataclasses.dataclass
+class SeriesConfig:
+    label: str
+    line_color: COLOR_TYPE_RGB = (0.2, 0.5, 0.8)
+    line_width: float = 2
+
+
+@dataclasses.dataclass
+class ChartSeries:
+    config: SeriesConfig
+    data: TimeSeries
+
+
+class HitTestIndex:
+    def __init__(self, series: TimeSeries, extents: "DataExtents | None" = None) -> None:
+        self.series = series
+        if extents is not None:
+            # Con zoom el eje X va de un extremo de la ventana al otro, no de la serie completa
+            self.ordinal_min = extents.date_min.toordinal()
+            self.days_total = (extents.date_max.toordinal() - self.ordinal_min) or 1
+        else:
+            self.ordinal_min = series.ordinals[0] if series else 0
+            self.days_total = (series.ordinals[-1] - self.ordinal_min if series else 0) or 1
+
+    @property
+    def ordinals(self) -> Sequence[int]:
+        # Se lee de la serie en cada consulta: una serie mapeada pasa a ser propia al primer cambio
+        return self.series.ordinals
+
+    def candidates(self, x: float, radius: float, margin_left: int, plot_width: int) -> range:
+        if plot_width <= 0:
+            return range(len(self.ordinals))
+        # Se amplía un día a cada lado para no perder puntos por redondeo
+        days_per_px = self.days_total / plot_width
+        low = self.ordinal_min + math.floor((x - radius - margin_left) * days_per_px) - 1
+        high = self.ordinal_min + math.ceil((x + radius - margin_left) * days_per_px) + 1
+        return range(bisect.bisect_left(self.ordinals, low), bisect.bisect_right(self.ordinals, high))
+
+
+class RangeExtrema:
+    # Árbol de segmentos iterativo: hojas en [capacity, capacity + size) y cada nodo guarda el mínimo
+    # y el máximo de sus dos hijos. Consulta en O(log n) y añadir al final en O(log n) amortizado.
+    def __init__(self, values: Sequence[float]) -> None:
+        self.size = len(values)
+        self.capacity = 1
+        while self.capacity < self.size:
+            self.capacity *= 2
+        self._build(values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _build(self, values: Sequence[float]) -> None:
+        capacity, size = self.capacity, self.size
+        np = numpy_module()
+        if np is not None:
+            low = self.low = np.full(2 * capacity, math.inf)
+            high = self.high = np.full(2 * capacity, -math.inf)
+            low[capacity:capacity + size] = high[capacity:capacity + size] = np.asarray(values, dtype=np.float64)
+            width = capacity // 2
+            while width:
+                low[width:2 * width] = np.minimum(low[2 * width:4 * width:2], low[2 * width + 1:4 * width:2])
+                high[width:2 * width] = np.maximum(high[2 * width:4 * width:2], high[2 * width + 1:4 * width:2])
+                width //= 2
+            return
+
+        self.low = array.array('d', [math.inf]) * (2 * capacity)
+        self.high = array.array('d', [-math.inf]) * (2 * capacity)
+        self.low[capacity:capacity + size] = array.array('d', values)
+        self.high[capacity:capacity + size] = array.array('d', values)
+        width = capacity // 2
+        while width:
+            self.low[width:2 * width] = array.array('d', map(min, self.low[2 * width:4 * width:2], self.low[2 * width + 1:4 * width:2]))
+            self.high[width:2 * width] = array.array('d', map(max, self.high[2 * width:4 * width:2], self.high[2 * width + 1:4 * width:2]))
+            width //= 2
+
+    def append(self, value: float) -> None:
+        if self.size == self.capacity:
+            # Lleno: se duplica la capacidad y se reconstruye desde las hojas actuales
+            leaves = self.low[self.capacity:self.capacity + self.size]
+            np = numpy_module()
+            self.size += 1
+            self.capacity *= 2
+            self._build(np.append(leaves, value) if np is not None else leaves + array.array('d', [value]))
+            return
+
+        node = self.capacity + self.size
+        self.size += 1
+        self.low[node] = self.high[node] = value
+        node //= 2
+        while node:
+            self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+            self.high[node] = max(self.high[2 * node], self.high[2 * node + 1])
+            node //= 2
+
+    def query(self, lo: int, hi: int) -> Tuple[float, float]:
+        low, high = math.inf, -math.inf
+        lo, hi = lo + self.capacity, min(hi, self.size) + self.capacity
+        while lo < hi:
+            if lo & 1:
+                low, high = min(low, self.low[lo]), max(high, self.high[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                low, high = min(low, self.low[hi]), max(high, self.high[hi])
+            lo //= 2
+            hi //= 2
+        return float(low), float(high)
+
+
+@dataclasses.dataclass(frozen=True)
+class Viewport:
+    start: int
+    end: int
+
+    @property
+    def span(self) -> int:
+        return self.end - self.start
+
+    def clamped(self, low: int, high: int) -> "Viewport":
+        # Se desplaza dentro de los datos conservando la anchura
+        span = min(self.span, high - low)
+        start = min(max(self.start, low), high - span)
+        return Viewport(start, start + span)
+
+    def zoomed(self, anchor: float, factor: float, low: int, high: int) -> "Viewport | None":
+        span = max(MIN_VIEWPORT_DAYS, round(self.span * factor))
+        if span >= high - low:
+            return None
+        # El día bajo el cursor se queda en la misma posición de pantalla
+        start = round(anchor - (anchor - self.start) * span / (self.span or 1))
+        return Viewport(start, start + span).clamped(low, high)
+
+    def panned(self, days: int, low: int, high: int) -> "Viewport":
+        return Viewport(self.start + days, self.end + days).clamped(low, high)
+
+
+@dataclasses.dataclass(frozen=True)
+class PlotArea:
+    margin_left: int
+    margin_top: int
+    width: int
+    height: int
+
+
+@dataclasses.dataclass(frozen=True)
+class DataExtents:
+    min_val: float
+    max_val: float
+    date_min: datetime.date
+    date_max: datetime.date
+
+    @classmethod
+    def from_series(cls, series: TimeSeries) -> "DataExtents":
+        np = numpy_module()
+        if np is not None:
+            values = np.frombuffer(series.values, dtype=np.float64)
+            return cls(
+                min_val=float(values.min()),
+                max_val=float(values.max()),
+                date_min=series.date_min,
+                date_max=series.date_max,
+            )
+        return cls(
+            min_val=min(series.values),
+            max_val=max(series.values),
+            date_min=series.date_min,
+            date_max=series.date_max,
+        )
+
+    def union(self, other: "DataExtents") -> "DataExtents":
+        return DataExtents(
+            min_val=min(self.min_val, other.min_val),
+            max_val=max(self.max_val, other.max_val),
+            date_min=min(self.date_min, other.date_min),
+            date_max=max(self.date_max, other.date_max),
+        )
+
+
+class ChartGeometry:
+    def __init__(self, margins: Tuple[int, int, int, int] = CHART_MARGINS) -> None:
+        self.margins = margins
+        self._size: Tuple[int, int] | None = None
+        self._plot_area: PlotArea | None = None
+        self._extents: DataExtents | None = None
+        self._hit_index: HitTestIndex | None = None
+        self._projection: PROJECTED_POINTS | None = None
+        self._projection_area: PlotArea | None = None
+        self._decimated: PROJECTED_POINTS | None = None
+        self._decimated_key: Tuple[PlotArea, str | None] | None = None
+        self._visible: range | None = None
+        self._extrema: RangeExtrema | None = None
+        self._pyramid: pyramid.AggregatePyramid | None = None
+        self._aggregated: PROJECTED_AGGREGATES | None = None
+        self._aggregated_key: PlotArea | None = None
+        self._statistics: statistics.RollingStatistics | None = None
+        self._overlays: Dict[str, PROJECTED_POINTS] = {}
+        self._overlays_key: PlotArea | None = None
+        self.extra_series: List[TimeSeries] = []
+        self._extra_extrema: Dict[int, RangeExtrema] = {}
+        self._extra_lines: List[Tuple[PROJECTED_POINTS, PROJECTED_POINTS]] = []
+        self._extra_lines_key: Tuple[PlotArea, str | None] | None = None
+        self.base_extents: DataExtents | None = None
+        self.viewport: Viewport | None = None
+        self.data_version = 0
+
+    def invalidate_derived(self) -> None:
+        # Lo que se recalcula con cualquier cambio, aunque los extremos y la proyección sigan valiendo
+        self.data_version += 1
+        self._decimated = None
+        self._visible = None
+        self._aggregated_key = None
+        self._overlays_key = None
+        self._extra_lines_key = None
+
+    def invalidate_view(self) -> None:
+        self.invalidate_derived()
+        self._extents = None
+        self._hit_index = None
+        self._projection = None
+
+    def invalidate_data(self) -> None:
+        self.invalidate_view()
+        self._extrema = None
+        self._pyramid = None
+        self._statistics = None
+
+    def set_extra_series(self, series: Iterable[TimeSeries]) -> None:
+        self.extra_series = list(series)
+        self._extra_extrema = {}
+        self.invalidate_view()
+
+    def set_viewport(self, viewport: Viewport | None) -> None:
+        if viewport != self.viewport:
+            self.viewport = viewport
+            self.invalidate_view()
+
+    def _extend_indexes(self, series: TimeSeries, count: int, appended: bool) -> None:
+        # Los extremos y las estadísticas se conservan mientras los datos nuevos lleguen al final
+        start = len(series) - count
+        if self._extrema is not None and appended and len(self._extrema) == start:
+            for value in series.values[start:]:
+                self._extrema.append(value)
+        else:
+            self._extrema = None
+        if self._statistics is not None and appended and len(self._statistics) == start:
+            self._statistics.extend(series.ordinals[start:], series.values[start:])
+        else:
+            self._statistics = None
+
+    def entry_inserted(self, series: TimeSeries, index: int) -> None:
+        self._extend_indexes(series, 1, index == len(series) - 1)
+        if self._pyramid is not None:
+            self._pyramid.add(series.ordinals[index], series.values[index])
+        if self._extents is None or self.viewport is not None:
+            self.invalidate_view()
+            return
+
+        self.invalidate_derived()
+        value = series.values[index]
+        date = datetime.date.fromordinal(series.ordinals[index])
+        extents = DataExtents(
+            min_val=min(self._extents.min_val, value),
+            max_val=max(self._extents.max_val, value),
+            date_min=min(self._extents.date_min, date),
+            date_max=max(self._extents.date_max, date),
+        )
+        if extents != self._extents:
+            self._extents = extents
+            self._hit_index = None
+            self._projection = None
+        elif self._projection is not None and self._projection_area is not None:
+            # Con los mismos extremos el resto de coordenadas no cambia
+            xs, ys = project_series(series[index:index + 1], self._projection_area, extents)
+            self._projection[0].insert(index, xs[0])
+            self._projection[1].insert(index, ys[0])
+
+    def entries_merged(self, series: TimeSeries, batch: TimeSeries, appended: bool = False) -> None:
+        extents = self._extents
+        self._extend_indexes(series, len(batch), appended)
+        # Un bloque anterior a los datos insertaría cubos uno a uno por delante: sale más barato reconstruir
+        if self._pyramid is not None and appended:
+            self._pyramid.extend(batch.ordinals, batch.values)
+        else:
+            self._pyramid = None
+        self.invalidate_view()
+        if extents is not None and batch and self.viewport is None:
+            self._extents = extents.union(DataExtents.from_series(batch))
+
+    def plot_area(self, width: int, height: int) -> PlotArea:
+        if self._plot_area is None or self._size != (width, height):
+            margin_left, margin_top, margin_right, margin_bottom = self.margins
+            self._size = (width, height)
+            self._plot_area = PlotArea(
+                margin_left=margin_left,
+                margin_top=margin_top,
+                width=width - margin_left - margin_right,
+                height=height - margin_top - margin_bottom,
+            )
+        return self._plot_area
+
+    def bounds(self, series: TimeSeries) -> Tuple[int, int]:
+        low, high = series.ordinals[0], series.ordinals[-1]
+        # Las series están ordenadas: el eje X compartido solo necesita sus extremos
+        for extra in self.extra_series:
+            if extra:
+                low, high = min(low, extra.ordinals[0]), max(high, extra.ordinals[-1])
+        if self.base_extents is not None:
+            low = min(low, self.base_extents.date_min.toordinal())
+            high = max(high, self.base_extents.date_max.toordinal())
+        return low, high
+
+    def window(self, series: TimeSeries) -> range:
+        if self.viewport is None:
+            return range(len(series))
+        ordinals = series.ordinals
+        return range(
+            bisect.bisect_left(ordinals, self.viewport.start),
+            bisect.bisect_right(ordinals, self.viewport.end),
+        )
+
+    def visible(self, series: TimeSeries) -> range:
+        if self._visible is None:
+            window = self.window(series)
+            # Un punto más a cada lado para que la línea llegue hasta el borde del área
+            self._visible = range(max(window.start - 1, 0), min(window.stop + 1, len(series)))
+        return self._visible
+
+    def range_extrema(self, series: TimeSeries) -> RangeExtrema:
+        if self._extrema is None:
+            self._extrema = RangeExtrema(series.values)
+        return self._extrema
+
+    def aggregate_pyramid(self, series: TimeSeries) -> pyramid.AggregatePyramid:
+        if self._pyramid is None:
+            self._pyramid = pyramid.AggregatePyramid.from_columns(series.ordinals, series.values)
+        return self._pyramid
+
+    def aggregated(self, series: TimeSeries, area: PlotArea) -> PROJECTED_AGGREGATES | None:
+        # Centros, medias, mínimos y máximos del nivel elegido; None si hay que dibujar los puntos
+        if self._aggregated_key != area:
+            start, end = (self.viewport.start, self.viewport.end) if self.viewport else self.bounds(series)
+            level = self.aggregate_pyramid(series).level_for(start, end, area.width)
+            self._aggregated = None
+            if level is not None:
+                window = level.window(start, end)
+                extents = self.extents(series)
+                centers = level.centers(window)
+                xs, means = project_columns(centers, level.means(window), area, extents)
+                _, lows = project_columns(centers, level.lows[window.start:window.stop], area, extents)
+                _, highs = project_columns(centers, level.highs[window.start:window.stop], area, extents)
+                self._aggregated = (xs, means, lows, highs)
+            self._aggregated_key = area
+        return self._aggregated
+
+    def rolling_statistics(self, series: TimeSeries) -> statistics.RollingStatistics:
+        if self._statistics is None:
+            self._statistics = statistics.RollingStatistics.from_columns(series.ordinals, series.values)
+        return self._statistics
+
+    def overlays(self, series: TimeSeries, area: PlotArea) -> Dict[str, PROJECTED_POINTS]:
+        if self._overlays_key != area:
+            stats = self.rolling_statistics(series)
+            extents = self.extents(series)
+            visible = self.visible(series)
+            # Las curvas suavizadas no necesitan más de dos muestras por píxel
+            step = max(1, len(visible) // (2 * max(area.width, 1)))
+            window = slice(visible.start, visible.stop, step)
+            ordinals = series.ordinals[window]
+            self._overlays = {
+                statistics.SMA: project_columns(ordinals, stats.sma[window], area, extents),
+                statistics.EMA: project_columns(ordinals, stats.ema[window], area, extents),
+            }
+            ends = [extents.date_min.toordinal(), extents.date_max.toordinal()]
+            first, last = (stats.trend_at(ordinal) for ordinal in ends)
+            if first is not None and last is not None:
+                self._overlays[statistics.TREND] = project_columns(ends, [first, last], area, extents)
+            self._overlays_key = area
+        return self._overlays
+
+    def extents(self, series: TimeSeries) -> DataExtents:
+        if self._extents is None and self.viewport is not None:
+            window = self.window(series)
+            if not window:
+                window = self.visible(series)
+            min_val, max_val = self.range_extrema(series).query(window.start, window.stop)
+            for i, extra in enumerate(self.extra_series):
+                window = self.window(extra)
+                if window:
+                    low, high = self._extra_range_extrema(i).query(window.start, window.stop)
+                    min_val, max_val = min(min_val, low), max(max_val, high)
+            self._extents = DataExtents(
+                min_val=min_val,
+                max_val=max_val,
+                date_min=datetime.date.fromordinal(self.viewport.start),
+                date_max=datetime.date.fromordinal(self.viewport.end),
+            )
+        elif self._extents is None:
+            extents = DataExtents.from_series(series)
+            for extra in self.extra_series:
+                if extra:
+                    extents = extents.union(DataExtents.from_series(extra))
+            # Los extremos precalculados por el repositorio evitan reescalar mientras llegan datos
+            self._extents = extents.union(self.base_extents) if self.base_extents is not None else extents
+        return self._extents
+
+    def _extra_range_extrema(self, index: int) -> RangeExtrema:
+        if index not in self._extra_extrema:
+            self._extra_extrema[index] = RangeExtrema(self.extra_series[index].values)
+        return self._extra_extrema[index]
+
+    def extra_lines(
+            self,
+            series: TimeSeries,
+            area: PlotArea,
+            method: str | None
+    ) -> List[Tuple[PROJECTED_POINTS, PROJECTED_POINTS]]:
+        # Proyección y línea diezmada de cada serie adicional, con los ejes de la principal
+        key = (area, method)
+        if self._extra_lines_key != key:
+            extents = self.extents(series)
+            self._extra_lines = []
+            for extra in self.extra_series:
+                window = self.window(extra)
+                visible = slice(max(window.start - 1, 0), min(window.stop + 1, len(extra)))
+                xs, ys = project_columns(extra.ordinals[visible], extra.values[visible], area, extents)
+                line = downsample.downsample(xs, ys, area.width, method) if method else (xs, ys)
+                self._extra_lines.append(((xs, ys), line))
+            self._extra_lines_key = key
+        return self._extra_lines
+
+    def hit_index(self, series: TimeSeries) -> HitTestIndex:
+        if self._hit_index is None:
+            self._hit_index = HitTestIndex(series, self.extents(series))
+        return self._hit_index
+
+    def projection(self, series: TimeSeries, area: PlotArea) -> PROJECTED_POINTS:
+        if self._projection is None or self._projection_area != area:
+            # Solo se proyecta la ventana visible; los índices quedan desplazados en visible().start
+            extents = self.extents(series)
+            visible = self.visible(series)
+            if len(visible) != len(series):
+                series = series[visible.start:visible.stop]
+            self._projection = project_series(series, area, extents)
+            self._projection_area = area
+        return self._projection
+
+    def decimated(self, series: TimeSeries, area: PlotArea, method: str | None) -> PROJECTED_POINTS:
+        key = (area, method)
+        if self._decimated is None or self._decimated_key != key:
+            xs, ys = self.projection(series, area)
+            self._decimated = downsample.downsample(xs, ys, area.width, method) if method else (xs, ys)
+            self._decimated_key = key
+        return self._decimated
+
+
+class LayerCache:
+    def __init__(self) -> None:
+        self.surface: cairo.ImageSurface | None = None
+        self.key: Tuple[Any, ...] | None = None
+
+    def invalidate(self) -> None:
+        self.surface = None
+        self.key = None
+
+    def get(
+            self,
+            key: Tuple[Any, ...],
+            width: int,
+            height: int,
+            scale_factor: int,
+            draw: Callable[[Any], None]
+    ) -> cairo.ImageSurface:
+        full_key = (width, height, scale_factor, *key)
+        if self.surface is None or self.key != full_key:
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width * scale_factor, height * scale_factor)
+            surface.set_device_scale(scale_factor, scale_factor)
+            draw(cairo.Context(surface))
+            surface.flush()
+            self.surface = surface
+            self.key = full_key
+        return self.surface
+
+
 class TimeSeriesChartWidget(Gtk.DrawingArea):
-    entries: List[TimeSeriesEntry] = []
+    _entries: TimeSeries
     hovered_point: int | None = None
+    loading: bool = False
+    _pointer_x: float = 0.0
+    _drag_origin: Viewport | None = None
     __gsignals__ = {
         "hover-changed": (GObject.SignalFlags.RUN_FIRST, None, (int,))
     }
 
     def __init__(
         self,
-        data: List[Tuple[str, float]],
-        config: ChartConfig
+        data: List[Tuple[str, float]] | TimeSeries,
+        config: ChartConfig,
+        series: Iterable[ChartSeries] = ()
     ) -> None:
         super().__init__()
+        self.geometry = ChartGeometry()
+        self.static_layer = LayerCache()
+        self.layouts = LayoutCache()
+        self.profiler = profiling.FrameProfiler()
         self._set_chart_size()
 
         self._load_entries_from_data(data)
+        self.extra_series: List[ChartSeries] = []
+        for item in series:
+            self.add_series(item.config, item.data)
 
         self.config = config
 
         self._initialize_motion_controller()
+        self._initialize_viewport_controllers()
+        self._initialize_shortcuts()
 
         self.is_dark = detect_dark_mode()
         self._connect_with_system_theme()
@@ -169,13 +736,75 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
         self.set_content_height(500)
         self.set_draw_func(self.on_draw)
 
-    def _load_entries_from_data(self, data: List[Tuple[str, float]]) -> None:
-        self.entries: List[TimeSeriesEntry] = []
+    @property
+    def entries(self) -> TimeSeries:
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: TimeSeries | List[TimeSeriesEntry]) -> None:
+        if not isinstance(entries, TimeSeries):
+            entries = TimeSeries.from_entries(entries)
+        self._entries = entries
+        self.geometry.viewport = None
+        self.geometry.invalidate_data()
+
+    @property
+    def hit_index(self) -> HitTestIndex:
+        return self.geometry.hit_index(self._entries)
+
+    def insert_entry(self, entry: TimeSeriesEntry) -> int:
+        index = self._entries.insert(entry.date, entry.value)
+        self.geometry.entry_inserted(self._entries, index)
+        if self.hovered_point is not None and self.hovered_point >= index:
+            self._set_hovered_point(self.hovered_point + 1)
+        self.queue_draw()
+        return index
+
+    def insert_entries(self, entries: TimeSeries | Iterable[TimeSeriesEntry]) -> None:
+        batch = entries if isinstance(entries, TimeSeries) else TimeSeries.from_entries(entries)
+        if not batch:
+            return
+        batch.sort()
+        appended = not self._entries or self._entries.ordinals[-1] <= batch.ordinals[0]
+        self._entries.merge(batch)
+        self.geometry.entries_merged(self._entries, batch, appended)
+        self._set_hovered_point(None)
+        self.queue_draw()
+
+    def _set_hovered_point(self, index: int | None) -> None:
+        if index != self.hovered_point:
+            self.hovered_point = index
+            self.emit("hover-changed", index if index is not None else -1)
+
+    def add_series(self, config: SeriesConfig, data: TimeSeries | Iterable[TimeSeriesEntry]) -> ChartSeries:
+        series = data if isinstance(data, TimeSeries) else TimeSeries.from_entries(data)
+        series.sort()
+        item = ChartSeries(config=config, data=series)
+        self.extra_series.append(item)
+        self._sync_extra_series()
+        return item
+
+    def remove_series(self, label: str) -> None:
+        self.extra_series = [item for item in self.extra_series if item.config.label != label]
+        self._sync_extra_series()
+
+    def _sync_extra_series(self) -> None:
+        self.geometry.set_extra_series(item.data for item in self.extra_series)
+        self.queue_draw()
+
+    def _load_entries_from_data(self, data: List[Tuple[str, float]] | TimeSeries) -> None:
+        if isinstance(data, TimeSeries):
+            data.sort()
+            self.entries = data
+            return
+
+        series = TimeSeries()
         for date_str, value in data:
             entry = TimeSeriesEntry.from_str(date_str, value)
             if entry:
-                self.entries.append(entry)
-        self.entries.sort(key=lambda x: x.date)
+                series.append(entry.date, entry.value)
+        series.sort()
+        self.entries = series
 
     def _initialize_motion_controller(self) -> None:
         self.set_focusable(True)
@@ -184,11 +813,94 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
         self.motion_controller.connect("leave", self.on_leave)
         self.add_controller(self.motion_controller)
 
+    def _initialize_viewport_controllers(self) -> None:
+        self.scroll_controller = Gtk.EventControllerScroll.new(Gtk.EventControllerScrollFlags.VERTICAL)
+        self.scroll_controller.connect("scroll", self.on_scroll)
+        self.add_controller(self.scroll_controller)
+
+        self.drag_gesture = Gtk.GestureDrag()
+        self.drag_gesture.connect("drag-begin", self.on_drag_begin)
+        self.drag_gesture.connect("drag-update", self.on_drag_update)
+        self.add_controller(self.drag_gesture)
+
+    def _initialize_shortcuts(self) -> None:
+        shortcuts = Gtk.ShortcutController()
+        shortcuts.set_scope(Gtk.ShortcutScope.MANAGED)
+        shortcuts.add_shortcut(Gtk.Shortcut.new(
+            Gtk.ShortcutTrigger.parse_string(DEBUG_OVERLAY_SHORTCUT),
+            Gtk.CallbackAction.new(self.on_toggle_debug_overlay),
+        ))
+        shortcuts.add_shortcut(Gtk.Shortcut.new(
+            Gtk.ShortcutTrigger.parse_string(RESET_VIEWPORT_SHORTCUT),
+            Gtk.CallbackAction.new(self.on_reset_viewport),
+        ))
+        self.add_controller(shortcuts)
+
+    def on_reset_viewport(self, _widget: Any, _args: Any) -> bool:
+        self.set_viewport(None)
+        return True
+
+    def set_viewport(self, viewport: Viewport | None) -> None:
+        if viewport == self.geometry.viewport:
+            return
+        self.geometry.set_viewport(viewport)
+        self._set_hovered_point(None)
+        self.queue_draw()
+
+    def on_scroll(self, _controller: Any, _dx: float, dy: float) -> bool:
+        area = self.geometry.plot_area(self.get_width(), self.get_height())
+        if not self.entries or area.width <= 0 or not dy:
+            return False
+        low, high = self.geometry.bounds(self.entries)
+        current = self.geometry.viewport or Viewport(low, high)
+        fraction = min(max((self._pointer_x - area.margin_left) / area.width, 0.0), 1.0)
+        anchor = current.start + fraction * current.span
+        self.set_viewport(current.zoomed(anchor, ZOOM_STEP ** dy, low, high))
+        return True
+
+    def on_drag_begin(self, _gesture: Any, _x: float, _y: float) -> None:
+        self._drag_origin = self.geometry.viewport
+
+    def on_drag_update(self, _gesture: Any, offset_x: float, _offset_y: float) -> None:
+        origin = self._drag_origin
+        area = self.geometry.plot_area(self.get_width(), self.get_height())
+        if origin is None or not self.entries or area.width <= 0:
+            return
+        # Arrastrar a la derecha muestra fechas anteriores
+        days = round(-offset_x * origin.span / area.width)
+        self.set_viewport(origin.panned(days, *self.geometry.bounds(self.entries)))
+
+    def on_toggle_debug_overlay(self, _widget: Any, _args: Any) -> bool:
+        self.profiler.toggle_overlay()
+        self.queue_draw()
+        return True
+
     def _connect_with_system_theme(self) -> None:
+        self.connect("notify::scale-factor", self.on_font_changed)
         settings = Gtk.Settings.get_default()
         if settings:
             settings.connect("notify::gtk-theme-name", self.on_theme_changed)
             settings.connect("notify::gtk-application-prefer-dark-theme", self.on_theme_changed)
+            settings.connect("notify::gtk-font-name", self.on_font_changed)
+            settings.connect("notify::gtk-xft-dpi", self.on_font_changed)
+
+    def set_loading(self, loading: bool) -> None:
+        if loading != self.loading:
+            self.loading = loading
+            self.queue_draw()
+
+    def set_extents(self, extents: DataExtents | None) -> None:
+        self.geometry.base_extents = extents
+        self.geometry.invalidate_data()
+        self.queue_draw()
+
+    def invalidate_static_layer(self) -> None:
+        self.static_layer.invalidate()
+        self.queue_draw()
+
+    def on_font_changed(self, _source: Any, _pspec: Any) -> None:
+        self.layouts.clear()
+        self.invalidate_static_layer()
 
     def on_theme_changed(self, _settings: Any, _pspec: Any) -> None:
         was_dark = self.is_dark
@@ -197,30 +909,29 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
             self.queue_draw()
 
     def on_motion(self, _controller: Any, x: float, y: float) -> None:
+        self._pointer_x = x
         width = self.get_width()
         height = self.get_height()
         if width <= 0 or height <= 0 or not self.entries:
             return
 
-        margin_left, margin_top, margin_right, margin_bottom = 100, 80, 60, 80
-        plot_width = width - margin_left - margin_right
-        plot_height = height - margin_top - margin_bottom
-
-        min_val = min(e.value for e in self.entries)
-        max_val = max(e.value for e in self.entries)
-        date_min = self.entries[0].date
-        date_max = self.entries[-1].date
+        area = self.geometry.plot_area(width, height)
+        xs, ys = self.geometry.projection(self.entries, area)
+        offset = self.geometry.visible(self.entries).start
 
-        threshold_sq = 15 ** 2
+        threshold_sq = HOVER_RADIUS ** 2
         hovered = None
 
-        for i, entry in enumerate(self.entries):
-            px = map_date_to_x_coordinate(entry.date, margin_left, plot_width, date_min, date_max)
-            py = value_to_y(entry.value, margin_top, plot_height, min_val, max_val)
+        start = self.profiler.start()
+        for i in self.hit_index.candidates(x, HOVER_RADIUS, area.margin_left, area.width):
+            if not 0 <= i - offset < len(xs):
+                continue
+            px, py = xs[i - offset], ys[i - offset]
             dist_sq = (px - x)**2 + (py - y)**2
             if dist_sq < threshold_sq:
                 hovered = i
                 break
+        self.profiler.record_since("hit_test", start)
 
         if hovered != self.hovered_point:
             self.hovered_point = hovered
@@ -235,98 +946,269 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
 
     def on_draw(self, _area: Any, cr: Any, width: int, height: int) -> None:
         colors = ChartStyle.get_colors(self.is_dark)
+        profiler = self.profiler
+        profiler.begin_frame()
 
+        # "layer" incluye el repintado de la capa estática cuando hace falta, cuyas fases se miden aparte
+        start = profiler.start()
+        cr.set_source_surface(self._get_static_layer(width, height, colors), 0, 0)
+        cr.paint()
+        start = profiler.lap("layer", start)
+
+        if self.entries:
+            self._draw_hover(cr, width, height, colors)
+            profiler.lap("tooltip", start)
+        profiler.end_frame()
+
+        if profiler.overlay_visible:
+            self._draw_debug_overlay(cr, width)
+
+    def _draw_debug_overlay(self, cr: Any, width: int) -> None:
+        layout = PangoCairo.create_layout(cr)
+        layout.set_font_description(Pango.FontDescription.from_string("Monospace 9"))
+        layout.set_text("\n".join(self.profiler.summary_lines()), -1)
+        lw, lh = layout.get_pixel_size()
+        x, y = width - lw - 20, 10
+
+        cr.set_source_rgba(0, 0, 0, 0.75)
+        cr.rectangle(x - 8, y - 6, lw + 16, lh + 12)
+        cr.fill()
+        cr.move_to(x, y)
+        cr.set_source_rgb(0.6, 1.0, 0.6)
+        PangoCairo.show_layout(cr, layout)
+
+    def _get_static_layer(self, width: int, height: int, colors: ChartColors) -> cairo.ImageSurface:
+        key = (self.is_dark, self.geometry.data_version, self.loading)
+        return self.static_layer.get(
+            key, width, height, self.get_scale_factor(),
+            lambda cr: self._draw_static(cr, width, height, colors),
+        )
+
+    def _draw_static(self, cr: Any, width: int, height: int, colors: ChartColors) -> None:
         # Fondo
         cr.set_source_rgb(*colors.bg)
         cr.paint()
 
         if not self.entries:
-            layout = create_layout(cr, "No hay datos disponibles", 16)
+            message = "Cargando datos…" if self.loading else "No hay datos disponibles"
+            layout = self.layouts.get(cr, message, 16)
             tw, th = layout.get_pixel_size()
             cr.move_to(width / 2 - tw / 2, height / 2)
             cr.set_source_rgb(*colors.text)
             PangoCairo.show_layout(cr, layout)
             return
 
-        margin_left, margin_top, margin_right, margin_bottom = 100, 80, 60, 80
-        plot_width = width - margin_left - margin_right
-        plot_height = height - margin_top - margin_bottom
+        area = self.geometry.plot_area(width, height)
+        margin_left, margin_top = area.margin_left, area.margin_top
+        plot_width, plot_height = area.width, area.height
 
-        min_val = min(e.value for e in self.entries)
-        max_val = max(e.value for e in self.entries)
-        date_min = self.entries[0].date
-        date_max = self.entries[-1].date
+        extents = self.geometry.extents(self.entries)
+        min_val, max_val = extents.min_val, extents.max_val
+        date_min, date_max = extents.date_min, extents.date_max
+        profiler = self.profiler
+        start = profiler.start()
 
         # Cuadrícula Y
         for i in range(6):
-            frac = i / 5
-            y = margin_top + plot_height - frac * plot_height
+            y = margin_top + plot_height - i / 5 * plot_height
             cr.set_source_rgb(*colors.grid)
             cr.move_to(margin_left, y)
             cr.line_to(margin_left + plot_width, y)
             cr.stroke()
 
+        # Cuadrícula X
+        for i in range(6):
+            x = margin_left + i / 5 * plot_width
+            cr.set_source_rgb(*colors.grid)
+            cr.move_to(x, margin_top)
+            cr.line_to(x, margin_top + plot_height)
+            cr.stroke()
+
+        # Ejes
+        cr.set_source_rgb(*colors.axes)
+        cr.set_line_width(2)
+        cr.move_to(margin_left, margin_top)
+        cr.line_to(margin_left, margin_top + plot_height)
+        cr.line_to(margin_left + plot_width, margin_top + plot_height)
+        cr.stroke()
+        start = profiler.lap("grid", start)
+
+        # Etiquetas Y (van fuera del área de trazado, así que el orden con la cuadrícula no importa)
+        for i in range(6):
+            frac = i / 5
+            y = margin_top + plot_height - frac * plot_height
             value = min_val + frac * (max_val - min_val)
             label = self.config.y_format.format(value)
-            layout = create_layout(cr, label, 10)
+            layout = self.layouts.get(cr, label, 10)
             tw, th = layout.get_pixel_size()
             cr.set_source_rgb(*colors.text)
             cr.move_to(margin_left - tw - 10, y - th / 2)
             PangoCairo.show_layout(cr, layout)
 
-        # Cuadrícula X
+        # Etiquetas X
+        days_total = (date_max - date_min).days or 1
         for i in range(6):
             frac = i / 5
             x = margin_left + frac * plot_width
-            cr.set_source_rgb(*colors.grid)
-            cr.move_to(x, margin_top)
-            cr.line_to(x, margin_top + plot_height)
-            cr.stroke()
-
-            days_total = (date_max - date_min).days or 1
             date_val = date_min + datetime.timedelta(days=int(frac * days_total))
-            layout = create_layout(cr, date_val.strftime("%d/%m"), 10)
+            layout = self.layouts.get(cr, date_val.strftime("%d/%m"), 10)
             tw, th = layout.get_pixel_size()
             cr.set_source_rgb(*colors.text)
             cr.move_to(x - tw / 2, margin_top + plot_height + 10)
             PangoCairo.show_layout(cr, layout)
+        start = profiler.lap("labels", start)
 
-        # Ejes
-        cr.set_source_rgb(*colors.axes)
+        aggregated = self.geometry.aggregated(self.entries, area) if self.config.aggregate else None
+
+        # Con zoom los puntos de borde caen fuera del área de trazado
+        zoomed = self.geometry.viewport is not None
+        if zoomed:
+            cr.save()
+            cr.rectangle(margin_left, margin_top, plot_width, plot_height)
+            cr.clip()
+
+        if aggregated is not None:
+            self._draw_aggregated(cr, aggregated, plot_width)
+            start = profiler.lap("line", start)
+        else:
+            xs, ys = self.geometry.projection(self.entries, area)
+            line_xs, line_ys = self.geometry.decimated(self.entries, area, self.config.downsampling)
+
+            # Línea
+            cr.set_source_rgb(*self.config.line_color)
+            cr.set_line_width(3)
+            cr.move_to(line_xs[0], line_ys[0])
+            for x, y in zip(line_xs[1:], line_ys[1:]):
+                cr.line_to(x, y)
+            cr.stroke()
+            start = profiler.lap("line", start)
+
+            # Marcadores
+            step = downsample.marker_step(len(xs), plot_width)
+            if step:
+                for x, y in zip(xs[::step], ys[::step]):
+                    cr.new_sub_path()
+                    cr.arc(x, y, 4, 0, 2 * 3.14159)
+                cr.fill()
+
+        # Series adicionales: cada una se acumula en un único trazado y se pinta con un solo stroke
+        extra_lines = self.geometry.extra_lines(self.entries, area, self.config.downsampling)
+        for item, ((xs, ys), (line_xs, line_ys)) in zip(self.extra_series, extra_lines):
+            if not line_xs:
+                continue
+            cr.set_source_rgb(*item.config.line_color)
+            cr.set_line_width(item.config.line_width)
+            cr.move_to(line_xs[0], line_ys[0])
+            for x, y in zip(line_xs[1:], line_ys[1:]):
+                cr.line_to(x, y)
+            cr.stroke()
+            step = downsample.marker_step(len(xs), plot_width)
+            if step:
+                for x, y in zip(xs[::step], ys[::step]):
+                    cr.new_sub_path()
+                    cr.arc(x, y, 3, 0, 2 * 3.14159)
+                cr.fill()
+        if zoomed:
+            cr.restore()
+        start = profiler.lap("markers", start)
+
+        if self.config.overlays:
+            self._draw_overlays(cr, area)
+            start = profiler.lap("overlays", start)
+
+        # Título y etiquetas
+        title = self.layouts.get(cr, self.config.title, 16, bold=True)
+        tw, th = title.get_pixel_size()
+        cr.move_to(width / 2 - tw / 2, margin_top - th - 20)
+        cr.set_source_rgb(*colors.text)
+        PangoCairo.show_layout(cr, title)
+
+        xlabel = self.layouts.get(cr, self.config.x_label, 12, bold=True)
+        tw, th = xlabel.get_pixel_size()
+        cr.move_to(margin_left + plot_width / 2 - tw / 2, margin_top + plot_height + 40)
+        PangoCairo.show_layout(cr, xlabel)
+
+        ylabel = self.layouts.get(cr, self.config.y_label, 12, bold=True)
+        tw, th = ylabel.get_pixel_size()
+        cr.move_to(margin_left, margin_top - th - 10)
+        PangoCairo.show_layout(cr, ylabel)
+
+        if self.extra_series:
+            self._draw_legend(cr, area, colors)
+        profiler.lap("title", start)
+
+    def _draw_legend(self, cr: Any, area: PlotArea, colors: ChartColors) -> None:
+        # Leyenda a la derecha, sobre el área de trazado, de la última serie a la primera
+        items = [(self.config.y_label, self.config.line_color)]
+        items += [(item.config.label, item.config.line_color) for item in self.extra_series]
+        x = area.margin_left + area.width
+        for label, color in reversed(items):
+            layout = self.layouts.get(cr, label, 10)
+            tw, th = layout.get_pixel_size()
+            x -= tw
+            y = area.margin_top - th - 10
+            cr.set_source_rgb(*colors.text)
+            cr.move_to(x, y)
+            PangoCairo.show_layout(cr, layout)
+            cr.set_source_rgb(*color)
+            cr.rectangle(x - 16, y + th / 2 - 5, 10, 10)
+            cr.fill()
+            x -= 32
+
+    def _draw_overlays(self, cr: Any, area: PlotArea) -> None:
+        overlays = self.geometry.overlays(self.entries, area)
+        cr.save()
+        cr.rectangle(area.margin_left, area.margin_top, area.width, area.height)
+        cr.clip()
         cr.set_line_width(2)
-        cr.move_to(margin_left, margin_top)
-        cr.line_to(margin_left, margin_top + plot_height)
-        cr.line_to(margin_left + plot_width, margin_top + plot_height)
-        cr.stroke()
+        for name in self.config.overlays:
+            points = overlays.get(name)
+            if not points or not points[0]:
+                continue
+            xs, ys = points
+            cr.set_dash([6, 4] if name == statistics.TREND else [])
+            cr.set_source_rgb(*self.config.overlay_colors[name])
+            cr.move_to(xs[0], ys[0])
+            for x, y in zip(xs[1:], ys[1:]):
+                cr.line_to(x, y)
+            cr.stroke()
+        cr.restore()
 
-        # Línea
+    def _draw_aggregated(self, cr: Any, aggregated: PROJECTED_AGGREGATES, plot_width: int) -> None:
+        xs, means, lows, highs = aggregated
         line_color = self.config.line_color
+
+        # Banda mínimo/máximo: se recorre por arriba y se vuelve por abajo
+        cr.set_source_rgba(*line_color, 0.2)
+        cr.move_to(xs[0], highs[0])
+        for x, y in zip(xs[1:], highs[1:]):
+            cr.line_to(x, y)
+        for x, y in zip(reversed(xs), reversed(lows)):
+            cr.line_to(x, y)
+        cr.close_path()
+        cr.fill()
+
+        # Media de cada cubo
+        method = self.config.downsampling
+        line_xs, line_ys = downsample.downsample(xs, means, plot_width, method) if method else (xs, means)
         cr.set_source_rgb(*line_color)
         cr.set_line_width(3)
-        first = True
-        for entry in self.entries:
-            x = map_date_to_x_coordinate(entry.date, margin_left, plot_width, date_min, date_max)
-            y = value_to_y(entry.value, margin_top, plot_height, min_val, max_val)
-            if first:
-                cr.move_to(x, y)
-                first = False
-            else:
-                cr.line_to(x, y)
+        cr.move_to(line_xs[0], line_ys[0])
+        for x, y in zip(line_xs[1:], line_ys[1:]):
+            cr.line_to(x, y)
         cr.stroke()
 
-        # Marcadores
-        for entry in self.entries:
-            x = map_date_to_x_coordinate(entry.date, margin_left, plot_width, date_min, date_max)
-            y = value_to_y(entry.value, margin_top, plot_height, min_val, max_val)
-            cr.arc(x, y, 4, 0, 2 * 3.14159)
-            cr.fill()
-
+    def _draw_hover(self, cr: Any, width: int, height: int, colors: ChartColors) -> None:
         # Resaltar punto
-        if self.hovered_point is not None and 0 <= self.hovered_point < len(self.entries):
+        if self.hovered_point is not None and self.hovered_point in self.geometry.visible(self.entries):
+            area = self.geometry.plot_area(width, height)
+            xs, ys = self.geometry.projection(self.entries, area)
             entry = self.entries[self.hovered_point]
-            x = map_date_to_x_coordinate(entry.date, margin_left, plot_width, date_min, date_max)
-            y = value_to_y(entry.value, margin_top, plot_height, min_val, max_val)
+            offset = self.geometry.visible(self.entries).start
+            x, y = xs[self.hovered_point - offset], ys[self.hovered_point - offset]
+            line_color = self.config.line_color
 
+            cr.set_line_width(3)
             cr.set_source_rgb(*colors.bg)
             cr.arc(x, y, 8, 0, 2 * 3.14159)
             cr.stroke()
@@ -337,7 +1219,7 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
 
             # Tooltip
             text = self.config.tooltip_formatter(entry.date, entry.value)
-            layout = create_layout(cr, text, 12)
+            layout = self.layouts.get(cr, text, 12)
             lw, lh = layout.get_pixel_size()
             tx, ty = x - lw / 2, y - lh - 15
             tx = max(10, min(tx, width - lw - 20))
@@ -353,21 +1235,4 @@ class TimeSeriesChartWidget(Gtk.DrawingArea):
 
             cr.move_to(tx, ty + 2)
             cr.set_source_rgb(*colors.tooltip_text)
-            PangoCairo.show_layout(cr, layout)
-
-        # Título y etiquetas
-        title = create_layout(cr, self.config.title, 16, bold=True)
-        tw, th = title.get_pixel_size()
-        cr.move_to(width / 2 - tw / 2, margin_top - th - 20)
-        cr.set_source_rgb(*colors.text)
-        PangoCairo.show_layout(cr, title)
-
-        xlabel = create_layout(cr, self.config.x_label, 12, bold=True)
-        tw, th = xlabel.get_pixel_size()
-        cr.move_to(margin_left + plot_width / 2 - tw / 2, margin_top + plot_height + 40)
-        PangoCairo.show_layout(cr, xlabel)
-
-        ylabel = create_layout(cr, self.config.y_label, 12, bold=True)
-        tw, th = ylabel.get_pixel_size()
-        cr.move_to(margin_left, margin_top - th - 10)
-        PangoCairo.show_layout(cr, ylabel)
\ No newline at end of file
+            PangoCairo.show_layout(cr, layout)
\ No newline at end of file
@@ -140,15 +140,18 @@ class ConfigurationDialog(Adw.Dialog):
         self.set_child(vbox)
 
         csv_filter = Gtk.FileFilter()
-        csv_filter.set_name("Archivos CSV")
+        csv_filter.set_name("Archivos CSV o SQLite")
         csv_filter.add_mime_type("text/csv")
         csv_filter.add_pattern("*.csv")
+        csv_filter.add_mime_type("application/vnd.sqlite3")
+        for pattern in ("*.db", "*.sqlite", "*.sqlite3"):
+            csv_filter.add_pattern(pattern)
 
         file_widget = SelectFileFormAttribute(
             title="Datos de peso:",
             default_path=file_path.as_posix() if file_path else "~",
             file_filter=csv_filter,
-            dialog_title="Elegir archivo CSV"
+            dialog_title="Elegir archivo de datos"
         )
         file_widget.connect("file-changed", self.on_file_changed)
         vbox.append(file_widget)
@@ -0,0 +1,184 @@
+from typing import Final, Iterable, Sequence, Tuple, Union
+import array
+import dataclasses
+import datetime
+import hashlib
+import itertools
+import logging
+import mmap
+import operator
+import os
+import pathlib
+import struct
+import sys
+
+
+MAGIC = b"HCCWGT01"
+HEADER = struct.Struct("<8sqqq32s")
+TAIL_BYTES = 4096
+ORDINAL_TYPECODE: Final = "i"
+VALUE_TYPECODE: Final = "d"
+
+FRESH = "fresh"
+APPENDED = "appended"
+STALE = "stale"
+
+# Una columna es un array propio o una vista de solo lectura (p. ej. sobre la caché mapeada)
+IntColumn = Union["array.array[int]", "memoryview[int]"]
+FloatColumn = Union["array.array[float]", "memoryview[float]"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class WeightColumns:
+    ordinals: IntColumn = dataclasses.field(default_factory=lambda: array.array(ORDINAL_TYPECODE))
+    values: FloatColumn = dataclasses.field(default_factory=lambda: array.array(VALUE_TYPECODE))
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def extend(self, records: Iterable[Tuple[datetime.date, float]]) -> None:
+        ordinals, values = self.ordinals, self.values
+        if not isinstance(ordinals, array.array) or not isinstance(values, array.array):
+            raise TypeError("Cannot extend read-only weight columns")
+        for date, value in records:
+            ordinals.append(date.toordinal())
+            values.append(value)
+
+    def sorted(self) -> "WeightColumns":
+        if is_sorted(self.ordinals):
+            return self
+        ordinals, values = sort_columns(self.ordinals, self.values)
+        return WeightColumns(ordinals=ordinals, values=values)
+
+
+def is_sorted(ordinals: Sequence[int]) -> bool:
+    return all(map(operator.le, ordinals, itertools.islice(ordinals, 1, None)))
+
+
+def sort_columns(
+        ordinals: Sequence[int],
+        values: Sequence[float]
+) -> Tuple["array.array[int]", "array.array[float]"]:
+    order = sorted(range(len(ordinals)), key=ordinals.__getitem__)
+    return (
+        array.array(ORDINAL_TYPECODE, (ordinals[i] for i in order)),
+        array.array(VALUE_TYPECODE, (values[i] for i in order)),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheHeader:
+    count: int
+    csv_size: int
+    csv_mtime_ns: int
+    tail_hash: bytes
+
+
+def _padding(offset: int) -> int:
+    return -offset % 8
+
+
+def _layout(header: CacheHeader) -> Tuple[int, int]:
+    ordinals_size = header.count * array.array(ORDINAL_TYPECODE).itemsize
+    return ordinals_size, HEADER.size + ordinals_size + _padding(HEADER.size + ordinals_size)
+
+
+def tail_hash(csv_path: pathlib.Path, size: int) -> bytes:
+    start = max(0, size - TAIL_BYTES)
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(size - start)).digest()
+
+
+class WeightCache:
+    def __init__(self, csv_path: pathlib.Path) -> None:
+        self.csv_path = csv_path
+        self.path = csv_path.with_name(f".{csv_path.name}.cache")
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def read_header(self) -> CacheHeader | None:
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read(HEADER.size)
+        except OSError:
+            return None
+        if len(raw) != HEADER.size:
+            return None
+        magic, count, csv_size, csv_mtime_ns, digest = HEADER.unpack(raw)
+        if magic != MAGIC or sys.byteorder != "little":
+            return None
+        return CacheHeader(count=count, csv_size=csv_size, csv_mtime_ns=csv_mtime_ns, tail_hash=digest)
+
+    def status(self, header: CacheHeader | None, stat: os.stat_result) -> str:
+        if header is None or stat.st_size < header.csv_size:
+            return STALE
+        if tail_hash(self.csv_path, header.csv_size) != header.tail_hash:
+            return STALE
+        if stat.st_size == header.csv_size and stat.st_mtime_ns == header.csv_mtime_ns:
+            return FRESH
+        # El CSV solo crece por el final: si la cola cacheada sigue igual basta con leer lo añadido.
+        # Con el mismo tamaño y otra fecha se editó en el sitio, y eso exige releerlo entero
+        if stat.st_size > header.csv_size > 0 and self._ends_with_newline(header.csv_size):
+            return APPENDED
+        return STALE
+
+    def _ends_with_newline(self, size: int) -> bool:
+        with open(self.csv_path, "rb") as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
+
+    def load(self, header: CacheHeader) -> WeightColumns:
+        ordinals_size, values_offset = _layout(header)
+        ordinals = array.array(ORDINAL_TYPECODE)
+        values = array.array(VALUE_TYPECODE)
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size)
+            ordinals.frombytes(f.read(ordinals_size))
+            f.seek(values_offset)
+            values.frombytes(f.read(header.count * values.itemsize))
+        if len(ordinals) != header.count or len(values) != header.count:
+            raise ValueError(f"Truncated weight cache {self.path}")
+        return WeightColumns(ordinals=ordinals, values=values)
+
+    def map(self, header: CacheHeader) -> WeightColumns:
+        ordinals_size, values_offset = _layout(header)
+        values_end = values_offset + header.count * array.array(VALUE_TYPECODE).itemsize
+        with open(self.path, "rb") as f:
+            # save() reemplaza el archivo con os.replace, así que el mapeo sigue viendo el inodo anterior
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < values_end:
+            mapped.close()
+            raise ValueError(f"Truncated weight cache {self.path}")
+        view = memoryview(mapped)
+        return WeightColumns(
+            ordinals=view[HEADER.size:HEADER.size + ordinals_size].cast(ORDINAL_TYPECODE),
+            values=view[values_offset:values_end].cast(VALUE_TYPECODE),
+        )
+
+    def save(self, columns: WeightColumns, stat: os.stat_result) -> None:
+        header = HEADER.pack(
+            MAGIC,
+            len(columns),
+            stat.st_size,
+            stat.st_mtime_ns,
+            tail_hash(self.csv_path, stat.st_size),
+        )
+        ordinals = columns.ordinals.tobytes()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(ordinals)
+                f.write(b"\0" * _padding(HEADER.size + len(ordinals)))
+                f.write(columns.values.tobytes())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write weight cache %s: %s", self.path, e)
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -1,10 +1,117 @@
+from typing import Iterable, Iterator, List, Tuple, cast
 import abc
+import bisect
+import contextlib
+import dataclasses
 import datetime
+import io
+import itertools
+import logging
+import os
 import pathlib
 import csv
+import functools
+import sqlite3
+import struct
+from health_control_chackra.domain import weight_cache
+
+
+DATE_FORMAT = "%Y-%m-%d"
+CHUNK_SIZE = 10_000
+HEADER = ["date", "weight"]
+MAX_ERROR_SAMPLES = 5
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+WRITE_BATCH_SIZE = 1_000
+
+FSYNC_NEVER = "never"
+FSYNC_ON_CLOSE = "close"
+FSYNC_ON_FLUSH = "flush"
+
+WeightRecord = Tuple[datetime.date, float]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ParseErrors:
+    count: int = 0
+    samples: List[Tuple[int, str]] = dataclasses.field(default_factory=list)
+
+    def add(self, line_number: int, line: str) -> None:
+        self.count += 1
+        if len(self.samples) < MAX_ERROR_SAMPLES:
+            self.samples.append((line_number, line.rstrip("\r\n")))
+
+    def log(self, source: object) -> None:
+        if self.count:
+            logger.warning("Skipped %d invalid rows in %s, first ones: %s", self.count, source, self.samples)
+
+
+def _parse_row_slow(line: str) -> WeightRecord:
+    row = next(csv.reader([line]))
+    if len(row) != 2:
+        raise ValueError(f"Expected 2 columns, got {len(row)}")
+    date_str, weight_str = row
+    return datetime.datetime.strptime(date_str.strip(), DATE_FORMAT).date(), float(weight_str)
+
+
+def parse_weight_lines(
+        lines: Iterable[str],
+        errors: ParseErrors,
+        first_line_number: int = 2
+) -> Iterator[WeightRecord]:
+    fromisoformat = datetime.date.fromisoformat
+    for line_number, line in enumerate(lines, first_line_number):
+        date_str, _, weight_str = line.partition(",")
+        try:
+            record = fromisoformat(date_str), float(weight_str)
+        except ValueError:
+            if not line.strip():
+                continue
+            # Filas con comillas, espacios o fechas sin ceros a la izquierda
+            try:
+                record = _parse_row_slow(line)
+            except (StopIteration, ValueError, csv.Error):
+                errors.add(line_number, line)
+                continue
+        yield record
+
+
+@dataclasses.dataclass(frozen=True)
+class WeightExtents:
+    date_min: datetime.date
+    date_max: datetime.date
+    weight_min: float
+    weight_max: float
+
+
+def _columns_range(columns: weight_cache.WeightColumns, start: datetime.date, end: datetime.date) -> List[WeightRecord]:
+    low = bisect.bisect_left(columns.ordinals, start.toordinal())
+    high = bisect.bisect_right(columns.ordinals, end.toordinal())
+    fromordinal = datetime.date.fromordinal
+    return [(fromordinal(columns.ordinals[i]), columns.values[i]) for i in range(low, high)]
+
+
+def _columns_extents(columns: weight_cache.WeightColumns) -> WeightExtents | None:
+    if not len(columns):
+        return None
+    return WeightExtents(
+        date_min=datetime.date.fromordinal(columns.ordinals[0]),
+        date_max=datetime.date.fromordinal(columns.ordinals[-1]),
+        weight_min=min(columns.values),
+        weight_max=max(columns.values),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class FilePosition:
+    offset: int
+    tail_hash: bytes
 
 
 class WeightRepository(abc.ABC):
+    file_path: pathlib.Path
+
     @abc.abstractmethod
     def exists(self) -> bool:
         raise NotImplementedError()
@@ -13,14 +120,147 @@ class WeightRepository(abc.ABC):
     def get_all(self) -> list[dict]:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[List[WeightRecord]]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_range(self, start: datetime.date, end: datetime.date) -> List[WeightRecord]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def extents(self) -> WeightExtents | None:
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def insert(self, weight: float, date: datetime.date) -> None:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def insert_many(self, records: Iterable[WeightRecord]) -> None:
+        raise NotImplementedError()
+
+    def writer(self, batch_size: int = WRITE_BATCH_SIZE) -> "WeightWriter":
+        return WeightWriter(self, batch_size=batch_size)
+
+    def iter_chunks_into(
+            self,
+            columns: weight_cache.WeightColumns,
+            chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[List[WeightRecord]]:
+        # Además de los bloques, deja en columns todo lo leído para quien necesite las columnas completas
+        for chunk in self.iter_chunks(chunk_size):
+            columns.extend(chunk)
+            yield chunk
+
+    def read_columns(self) -> weight_cache.WeightColumns:
+        columns = weight_cache.WeightColumns()
+        for chunk in self.iter_chunks():
+            columns.extend(chunk)
+        return columns.sorted()
+
+    def map_columns(self) -> weight_cache.WeightColumns:
+        return self.read_columns()
+
+    def can_read_columns_fast(self) -> bool:
+        return False
+
+    def has_fast_extents(self) -> bool:
+        return False
+
+    def position(self) -> FilePosition | None:
+        return None
+
+    def read_since(self, position: FilePosition) -> Tuple[List[WeightRecord], FilePosition] | None:
+        return None
+
+
+class WeightWriter:
+    def __init__(self, repository: WeightRepository, batch_size: int = WRITE_BATCH_SIZE) -> None:
+        self.repository = repository
+        self.batch_size = batch_size
+        self.pending: List[WeightRecord] = []
+
+    def __enter__(self) -> "WeightWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, date: datetime.date, weight: float) -> None:
+        self.pending.append((date, weight))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        # Si la escritura falla las filas siguen pendientes para el siguiente intento
+        self._write_batch(self.pending)
+        self.pending = []
+
+    def _write_batch(self, batch: List[WeightRecord]) -> None:
+        self.repository.insert_many(batch)
+
+    def close(self) -> None:
+        self.flush()
+
+
+class CsvWeightWriter(WeightWriter):
+    repository: "FileCsvWeightRepository"
+
+    def __init__(
+            self,
+            repository: "FileCsvWeightRepository",
+            batch_size: int = WRITE_BATCH_SIZE,
+            fsync: str = FSYNC_ON_CLOSE
+    ) -> None:
+        super().__init__(repository, batch_size=batch_size)
+        self.fsync = fsync
+        self._file: io.TextIOWrapper | None = None
+
+    def _write_batch(self, batch: List[WeightRecord]) -> None:
+        if self._file is None:
+            self._file = self.repository.open_for_append()
+        try:
+            csv.writer(self._file).writerows(_csv_rows(batch))
+            self._file.flush()
+        except OSError:
+            # Se cierra el archivo para que el reintento no arrastre lo que quedó en el búfer
+            file, self._file = self._file, None
+            with contextlib.suppress(OSError):
+                file.close()
+            raise
+        if self.fsync == FSYNC_ON_FLUSH:
+            # Las filas ya están en el archivo: reintentarlas las duplicaría
+            try:
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.warning("Could not fsync %s: %s", self.repository.file_path, e)
+
+    def close(self) -> None:
+        super().close()
+        if self._file is None:
+            return
+        if self.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+
+def _csv_rows(records: Iterable[WeightRecord]) -> Iterator[Tuple[str, float]]:
+    for date, weight in records:
+        yield date.strftime(DATE_FORMAT), weight
+
 
 class FileCsvWeightRepository(WeightRepository):
-    def __init__(self, file_path: pathlib.Path):
+    def __init__(self, file_path: pathlib.Path, use_cache: bool = True):
         self.file_path = file_path
+        self.cache = weight_cache.WeightCache(file_path) if use_cache else None
 
     def exists(self) -> bool:
         return self.file_path.exists()
@@ -30,11 +270,419 @@ class FileCsvWeightRepository(WeightRepository):
             reader = csv.DictReader(f)
             return list(reader)
 
+    def iter_records(self, errors: ParseErrors | None = None) -> Iterator[WeightRecord]:
+        errors = errors if errors is not None else ParseErrors()
+        with open(self.file_path, 'r', newline='') as f:
+            header = f.readline()
+            if not header:
+                return
+            if [column.strip() for column in header.split(",")] == HEADER:
+                yield from parse_weight_lines(f, errors)
+            else:
+                yield from self._iter_records_dict_reader(itertools.chain([header], f), errors)
+        errors.log(self.file_path)
+
+    def _iter_records_dict_reader(self, lines: Iterable[str], errors: ParseErrors) -> Iterator[WeightRecord]:
+        for line_number, row in enumerate(csv.DictReader(lines), 2):
+            try:
+                yield datetime.datetime.strptime(row['date'], DATE_FORMAT).date(), float(row['weight'])
+            except (KeyError, TypeError, ValueError):
+                errors.add(line_number, str(row))
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[List[WeightRecord]]:
+        if self._is_cacheable():
+            yield from self.iter_chunks_into(weight_cache.WeightColumns(), chunk_size)
+            return
+        records = self.iter_records()
+        while chunk := list(itertools.islice(records, chunk_size)):
+            yield chunk
+
+    def iter_chunks_into(
+            self,
+            columns: weight_cache.WeightColumns,
+            chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[List[WeightRecord]]:
+        # Las columnas de quien llama son las mismas que se guardan en la caché binaria
+        stat = os.stat(self.file_path)
+        cacheable = self._is_cacheable()
+        records = self.iter_records()
+        while chunk := list(itertools.islice(records, chunk_size)):
+            columns.extend(chunk)
+            yield chunk
+        if cacheable:
+            self._save_cache(columns, stat)
+
+    def cache_status(self) -> str:
+        if not self._is_cacheable():
+            return weight_cache.STALE
+        assert self.cache is not None
+        return self.cache.status(self.cache.read_header(), os.stat(self.file_path))
+
+    def read_columns(self) -> weight_cache.WeightColumns:
+        stat = os.stat(self.file_path)
+        if self._is_cacheable():
+            assert self.cache is not None
+            header = self.cache.read_header()
+            status = self.cache.status(header, stat)
+            try:
+                if header is not None and status == weight_cache.FRESH:
+                    return self.cache.load(header)
+                if header is not None and status == weight_cache.APPENDED:
+                    columns = self.cache.load(header)
+                    columns.extend(self._read_range(header.csv_size, stat.st_size))
+                    columns = columns.sorted()
+                    self._save_cache(columns, stat)
+                    return columns
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable weight cache %s: %s", self.cache.path, e)
+
+        columns = weight_cache.WeightColumns()
+        columns.extend(self.iter_records())
+        columns = columns.sorted()
+        self._save_cache(columns, stat)
+        return columns
+
+    def map_columns(self) -> weight_cache.WeightColumns:
+        if self.cache_status() != weight_cache.FRESH:
+            columns = self.read_columns()
+            if self.cache_status() != weight_cache.FRESH:
+                return columns
+        assert self.cache is not None
+        header = self.cache.read_header()
+        if header is None:
+            return self.read_columns()
+        try:
+            return self.cache.map(header)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not map weight cache %s: %s", self.cache.path, e)
+            return self.read_columns()
+
+    def get_range(self, start: datetime.date, end: datetime.date) -> List[WeightRecord]:
+        if not self.exists():
+            return []
+        return _columns_range(self.map_columns(), start, end)
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        return len(self.map_columns())
+
+    def extents(self) -> WeightExtents | None:
+        if not self.exists():
+            return None
+        return _columns_extents(self.map_columns())
+
+    def can_read_columns_fast(self) -> bool:
+        return self.exists() and self.cache_status() != weight_cache.STALE
+
+    def has_fast_extents(self) -> bool:
+        return self.can_read_columns_fast()
+
+    def position(self) -> FilePosition | None:
+        try:
+            size = os.stat(self.file_path).st_size
+            with open(self.file_path, 'rb') as f:
+                f.seek(max(0, size - weight_cache.TAIL_BYTES))
+                tail = f.read()
+        except OSError:
+            return None
+        # Una última línea a medio escribir se deja para la siguiente lectura
+        offset = size - len(tail) + tail.rfind(b"\n") + 1
+        return FilePosition(offset=offset, tail_hash=weight_cache.tail_hash(self.file_path, offset))
+
+    def read_since(self, position: FilePosition) -> Tuple[List[WeightRecord], FilePosition] | None:
+        try:
+            size = os.stat(self.file_path).st_size
+        except OSError:
+            return None
+        if position.offset == 0 or size < position.offset or not self._has_standard_header():
+            return None
+        if weight_cache.tail_hash(self.file_path, position.offset) != position.tail_hash:
+            return None
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(position.offset)
+            data = f.read(size - position.offset)
+        end = data.rfind(b"\n") + 1
+        offset = position.offset + end
+        records = self._parse_bytes(data[:end])
+        return records, FilePosition(offset=offset, tail_hash=weight_cache.tail_hash(self.file_path, offset))
+
+    def _is_cacheable(self) -> bool:
+        return self.cache is not None and self._has_standard_header()
+
+    def _has_standard_header(self) -> bool:
+        try:
+            with open(self.file_path, 'r', newline='') as f:
+                header = f.readline()
+        except OSError:
+            return False
+        return [column.strip() for column in header.split(",")] == HEADER
+
+    def _read_range(self, start: int, end: int) -> List[WeightRecord]:
+        with open(self.file_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return self._parse_bytes(data)
+
+    def _parse_bytes(self, data: bytes) -> List[WeightRecord]:
+        errors = ParseErrors()
+        records = list(parse_weight_lines(io.StringIO(data.decode("utf-8", errors="replace")), errors))
+        errors.log(self.file_path)
+        return records
+
+    def _save_cache(self, columns: weight_cache.WeightColumns, stat: os.stat_result) -> None:
+        if self.cache is None:
+            return
+        # Si el CSV cambió mientras se leía, la caché no correspondería a ningún estado del archivo
+        current = os.stat(self.file_path)
+        if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return
+        self.cache.save(columns.sorted(), stat)
+
+    def open_for_append(self) -> io.TextIOWrapper:
+        f = open(self.file_path, 'a', newline='')
+        if f.tell() == 0:
+            f.write('date,weight\n')
+        return f
+
     def insert(self, weight: float, date: datetime.date) -> None:
+        self.insert_many([(date, weight)])
+
+    def insert_many(self, records: Iterable[WeightRecord]) -> None:
+        with self.open_for_append() as f:
+            csv.writer(f).writerows(_csv_rows(records))
+
+    def writer(self, batch_size: int = WRITE_BATCH_SIZE, fsync: str = FSYNC_ON_CLOSE) -> CsvWeightWriter:
+        return CsvWeightWriter(self, batch_size=batch_size, fsync=fsync)
+
+
+class SqliteWeightRepository(WeightRepository):
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS weights (date TEXT NOT NULL, weight REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS weights_date_idx ON weights (date)",
+        # Con un índice por peso MIN/MAX se resuelven sin recorrer la tabla
+        "CREATE INDEX IF NOT EXISTS weights_weight_idx ON weights (weight)",
+    )
+
+    def __init__(self, file_path: pathlib.Path):
+        self.file_path = file_path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.file_path)
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+            self._initialized = True
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def exists(self) -> bool:
+        return self.file_path.exists()
+
+    # Las lecturas no abren la conexión si no hay base: _connect() la crearía vacía en disco
+    def get_all(self) -> list[dict]:
         if not self.exists():
-            self.file_path.touch()
-            self.file_path.write_text('date,weight\n')
+            return []
+        with contextlib.closing(self._connect()) as connection:
+            rows = connection.execute("SELECT date, weight FROM weights ORDER BY date").fetchall()
+        return [{'date': date, 'weight': str(weight)} for date, weight in rows]
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[List[WeightRecord]]:
+        if not self.exists():
+            return
+        fromisoformat = datetime.date.fromisoformat
+        with contextlib.closing(self._connect()) as connection:
+            cursor = connection.execute("SELECT date, weight FROM weights ORDER BY date")
+            while rows := cursor.fetchmany(chunk_size):
+                yield [(fromisoformat(date), weight) for date, weight in rows]
+
+    def get_range(self, start: datetime.date, end: datetime.date) -> List[WeightRecord]:
+        if not self.exists():
+            return []
+        fromisoformat = datetime.date.fromisoformat
+        with contextlib.closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT date, weight FROM weights WHERE date BETWEEN ? AND ? ORDER BY date",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [(fromisoformat(date), weight) for date, weight in rows]
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        with contextlib.closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM weights").fetchone()[0]
+
+    def extents(self) -> WeightExtents | None:
+        if not self.exists():
+            return None
+        with contextlib.closing(self._connect()) as connection:
+            # Consultas separadas para que SQLite use el índice en cada MIN/MAX
+            date_min, date_max, weight_min, weight_max = (
+                connection.execute(f"SELECT {aggregate}({column}) FROM weights").fetchone()[0]
+                for aggregate, column in (("MIN", "date"), ("MAX", "date"), ("MIN", "weight"), ("MAX", "weight"))
+            )
+        if date_min is None:
+            return None
+        return WeightExtents(
+            date_min=datetime.date.fromisoformat(date_min),
+            date_max=datetime.date.fromisoformat(date_max),
+            weight_min=weight_min,
+            weight_max=weight_max,
+        )
+
+    def has_fast_extents(self) -> bool:
+        return self.exists()
+
+    # La posición es el último rowid leído; en tail_hash va cuántas filas había hasta él,
+    # así un borrado hace que read_since pida recargar todo
+    def position(self) -> FilePosition | None:
+        if not self.exists():
+            return None
+        with contextlib.closing(self._connect()) as connection:
+            count, last = connection.execute("SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM weights").fetchone()
+        return FilePosition(offset=last, tail_hash=struct.pack("<q", count))
+
+    def read_since(self, position: FilePosition) -> Tuple[List[WeightRecord], FilePosition] | None:
+        if not self.exists():
+            return None
+        fromisoformat = datetime.date.fromisoformat
+        with contextlib.closing(self._connect()) as connection:
+            count = connection.execute("SELECT COUNT(*) FROM weights WHERE rowid <= ?", (position.offset,)).fetchone()[0]
+            if struct.pack("<q", count) != position.tail_hash:
+                return None
+            rows = connection.execute(
+                "SELECT rowid, date, weight FROM weights WHERE rowid > ? ORDER BY rowid",
+                (position.offset,),
+            ).fetchall()
+        if not rows:
+            return [], position
+        return (
+            [(fromisoformat(date), weight) for _, date, weight in rows],
+            FilePosition(offset=rows[-1][0], tail_hash=struct.pack("<q", count + len(rows))),
+        )
+
+    def insert(self, weight: float, date: datetime.date) -> None:
+        self.insert_many([(date, weight)])
+
+    def insert_many(self, records: Iterable[WeightRecord]) -> None:
+        with contextlib.closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO weights (date, weight) VALUES (?, ?)",
+                    ((date.isoformat(), float(weight)) for date, weight in records),
+                )
+
+
+def _readonly(columns: weight_cache.WeightColumns) -> weight_cache.WeightColumns:
+    return weight_cache.WeightColumns(
+        ordinals=memoryview(columns.ordinals).toreadonly(),
+        values=cast("memoryview[float]", memoryview(columns.values).toreadonly()),
+    )
+
+
+class CachedWeightRepository(WeightRepository):
+    def __init__(self, repository: WeightRepository):
+        self.repository = repository
+        self.file_path = repository.file_path
+        self._columns: weight_cache.WeightColumns | None = None
+        self._signature: Tuple | None = None
+
+    def _file_signature(self) -> Tuple:
+        # En modo WAL las escrituras de SQLite van al -wal antes que al archivo principal
+        signature: List[Tuple[int, int, int, int] | None] = []
+        for path in (self.file_path, self.file_path.with_name(self.file_path.name + "-wal")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def _cached_columns(self) -> weight_cache.WeightColumns | None:
+        if self._columns is not None and self._signature == self._file_signature():
+            return self._columns
+        return None
+
+    def invalidate(self) -> None:
+        self._columns = None
+        self._signature = None
+
+    def read_columns(self) -> weight_cache.WeightColumns:
+        columns = self._cached_columns()
+        if columns is None:
+            signature = self._file_signature()
+            columns = _readonly(self.repository.map_columns()) if self.exists() else weight_cache.WeightColumns()
+            self._columns, self._signature = columns, signature
+        return columns
+
+    def can_read_columns_fast(self) -> bool:
+        return self._cached_columns() is not None or self.repository.can_read_columns_fast()
+
+    def has_fast_extents(self) -> bool:
+        return self._cached_columns() is not None or self.repository.has_fast_extents()
+
+    def position(self) -> FilePosition | None:
+        return self.repository.position()
+
+    def read_since(self, position: FilePosition) -> Tuple[List[WeightRecord], FilePosition] | None:
+        return self.repository.read_since(position)
+
+    def exists(self) -> bool:
+        return self.repository.exists()
+
+    def get_all(self) -> list[dict]:
+        return self.repository.get_all()
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[List[WeightRecord]]:
+        cached = self._cached_columns()
+        if cached is not None:
+            fromordinal = datetime.date.fromordinal
+            for start in range(0, len(cached), chunk_size):
+                end = min(start + chunk_size, len(cached))
+                yield [(fromordinal(cached.ordinals[i]), cached.values[i]) for i in range(start, end)]
+            return
+
+        signature = self._file_signature()
+        columns = weight_cache.WeightColumns()
+        yield from self.repository.iter_chunks_into(columns, chunk_size)
+        self._columns, self._signature = _readonly(columns.sorted()), signature
+
+    def get_range(self, start: datetime.date, end: datetime.date) -> List[WeightRecord]:
+        cached = self._cached_columns()
+        return _columns_range(cached, start, end) if cached is not None else self.repository.get_range(start, end)
+
+    def count(self) -> int:
+        cached = self._cached_columns()
+        return len(cached) if cached is not None else self.repository.count()
+
+    def extents(self) -> WeightExtents | None:
+        cached = self._cached_columns()
+        return _columns_extents(cached) if cached is not None else self.repository.extents()
+
+    def insert(self, weight: float, date: datetime.date) -> None:
+        self.insert_many([(date, weight)])
+
+    def insert_many(self, records: Iterable[WeightRecord]) -> None:
+        self.repository.insert_many(records)
+        self.invalidate()
+
+    def writer(self, batch_size: int = WRITE_BATCH_SIZE) -> WeightWriter:
+        # El escritor del backend conserva su sesión; lo que escriba cambia la firma del archivo
+        return self.repository.writer(batch_size=batch_size)
+
+
+def create_weight_repository(file_path: pathlib.Path) -> WeightRepository:
+    if file_path.suffix.lower() in SQLITE_SUFFIXES:
+        return SqliteWeightRepository(file_path)
+    return FileCsvWeightRepository(file_path)
+
 
-        with open(self.file_path, 'a') as f:
-            writer = csv.DictWriter(f, fieldnames=['date', 'weight'])
-            writer.writerow({'date': date.strftime('%Y-%m-%d'), 'weight': weight})
+@functools.lru_cache(maxsize=8)
+def cached_weight_repository(file_path: pathlib.Path) -> CachedWeightRepository:
+    return CachedWeightRepository(create_weight_repository(file_path))
@@ -0,0 +1,52 @@
+from typing import Iterator, List, Tuple
+import contextlib
+import dataclasses
+import time
+
+
+STARTUP_BUDGET_MS = 400.0
+FIRST_FRAME = "first frame"
+
+
+@dataclasses.dataclass
+class StartupProfile:
+    budget_ms: float = STARTUP_BUDGET_MS
+    origin: float = dataclasses.field(default_factory=time.perf_counter)
+    marks: List[Tuple[str, float]] = dataclasses.field(default_factory=list)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, self.elapsed_ms()))
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = self.elapsed_ms()
+        yield
+        end = self.elapsed_ms()
+        self.marks.append((f"{name} ({end - start:.1f} ms)", end))
+
+    def first_frame_ms(self) -> float | None:
+        return next((at for name, at in self.marks if name == FIRST_FRAME), None)
+
+    def within_budget(self) -> bool:
+        first_frame = self.first_frame_ms()
+        return first_frame is not None and first_frame <= self.budget_ms
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        previous = 0.0
+        for name, at in self.marks:
+            lines.append(f"  {at:8.1f} ms  (+{at - previous:6.1f})  {name}")
+            previous = at
+        first_frame = self.first_frame_ms()
+        if first_frame is None:
+            lines.append("  first frame not reached")
+        else:
+            status = "OK" if self.within_budget() else "OVER BUDGET"
+            lines.append(f"  time to first frame: {first_frame:.1f} ms / budget {self.budget_ms:.0f} ms [{status}]")
+        return "\n".join(lines)
+
+
+profile = StartupProfile()
@@ -1,21 +1,39 @@
+import collections
 import logging
 import pathlib
 import datetime
+import threading
+import time
 import gi  # type: ignore
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gtk  # noqa: E402
+from gi.repository import GLib  # noqa: E402
+from gi.repository import Gio  # noqa: E402
 from gi.repository import Adw  # noqa: E402
 from health_control_chackra.domain import configuration_repository, weight_repository  # noqa: E402
-from health_control_chackra.chart import time_series_chart  # noqa: E402
-from health_control_chackra.dialog import configuration_dialog, add_weight_dialog  # noqa: E402
+from health_control_chackra.chart import profiling, time_series_chart  # noqa: E402
 
 
 logger = logging.getLogger(__name__)
 
+PROGRESS_INTERVAL = 0.25
+FLUSH_DELAY_SECONDS = 2
+RELOAD_DELAY_MS = 300
+LOAD_WINDOW_DAYS = 365
+
 
 class MainWindow(Adw.ApplicationWindow):
     banner: Adw.Banner | None = None
+    repository: weight_repository.WeightRepository | None = None
+    writer: weight_repository.WeightWriter | None = None
+    monitor: Gio.FileMonitor | None = None
+    _load_generation: int = 0
+    _load_started: float = 0.0
+    _flush_source: int | None = None
+    _reload_source: int | None = None
+    _file_position: weight_repository.FilePosition | None = None
+    _changed_while_loading: bool = False
 
     def __init__(
             self,
@@ -27,24 +45,30 @@ class MainWindow(Adw.ApplicationWindow):
         self.json_path = json_path
         self.configuration = configuration or {}
         self.current_file_path: pathlib.Path | None = None
+        # Filas escritas por esta ventana que el monitor verá como añadidas desde fuera
+        self._own_records: collections.Counter = collections.Counter()
 
         self.set_title("📉 Seguimiento de Peso")
         self.set_default_size(1000, 700)
+        self.connect("close-request", self.on_close_request)
 
         toolbar_view = Adw.ToolbarView()
         self.set_content(toolbar_view)
 
-        data = self._load_initial_data()
+        path = self._configured_file_path()
 
-        if not data:
+        if path is None:
             self._add_missing_file_banner(toolbar_view)
 
         header_bar = self._create_headerbar()
         toolbar_view.add_top_bar(header_bar)
 
-        self.chart = self._create_chart(data)
+        self.chart = self._create_chart(time_series_chart.TimeSeries())
         toolbar_view.set_content(self.chart)
 
+        if path is not None:
+            self.load_data_from_path(path)
+
     def _add_missing_file_banner(self, toolbar_view: Adw.ToolbarView) -> None:
         self.banner = Adw.Banner.new("⚠️ No se ha configurado el archivo de datos.")
         self.banner.set_revealed(True)
@@ -73,79 +97,275 @@ class MainWindow(Adw.ApplicationWindow):
 
         return header_bar
 
-    def _create_chart(self, data) -> time_series_chart.TimeSeriesChartWidget:
+    def _create_chart(self, data: time_series_chart.TimeSeries) -> time_series_chart.TimeSeriesChartWidget:
         config = time_series_chart.ChartConfig(
             title="Seguimiento de Peso",
             y_label="Peso (kg)",
             y_format="{:.1f}",
             line_color=(0.2, 0.5, 0.8),
         )
-        return time_series_chart.TimeSeriesChartWidget(data=data, config=config)
+        chart = time_series_chart.TimeSeriesChartWidget(data=data, config=config)
+        if profiling.logger.isEnabledFor(logging.DEBUG):
+            chart.profiler.add_listener(profiling.log_frame)
+        return chart
 
-    def _load_initial_data(self) -> list[tuple[str, float]]:
+    def _configured_file_path(self) -> pathlib.Path | None:
         file_path_str = self.configuration.get("file_csv", "").strip()
         if not file_path_str:
-            return []
+            return None
 
         path = pathlib.Path(file_path_str)
         if not path.exists():
             logger.warning(f"Archivo CSV no encontrado: {path}")
-            return []
-
-        try:
-            repo = weight_repository.FileCsvWeightRepository(path)
-            data = [(entry["date"], float(entry["weight"])) for entry in repo.get_all()]
-            logger.info("Loading data... %d register from %s", len(data), path)
-            self.current_file_path = path
-            return data
-        except Exception as e:
-            logger.error(f"Error al cargar datos: {e}")
-            return []
+            return None
+        return path
 
     def load_data_from_path(self, path: pathlib.Path) -> None:
+        self._close_writer()
+        self.repository = weight_repository.cached_weight_repository(path.resolve())
+        self.current_file_path = path
+        self._own_records.clear()
+        self._file_position = None
+        self._changed_while_loading = False
+        self._watch_file(path)
+        self._load_generation += 1
+        self._load_started = time.perf_counter()
+        self.chart.entries = time_series_chart.TimeSeries()
+        self.chart.set_extents(None)
+        self.chart.set_loading(True)
+        thread = threading.Thread(
+            target=self._load_worker,
+            args=(self._load_generation, path, self.repository),
+            name="weight-loader",
+            daemon=True,
+        )
+        thread.start()
+
+    def _load_worker(self, generation: int, path: pathlib.Path, repo: weight_repository.WeightRepository) -> None:
         try:
-            repo = weight_repository.FileCsvWeightRepository(path)
-            entries = [
-                time_series_chart.TimeSeriesEntry.from_str(entry["date"], float(entry["weight"]))
-                for entry in repo.get_all()
-            ]
-            current_entries: list[time_series_chart.TimeSeriesEntry] = [e for e in entries if e]
-            self.chart.entries = sorted(current_entries, key=lambda x: x.date)
-            self.chart.queue_draw()
-            self.current_file_path = path
-            logger.info(f"✅ Datos recargados desde {path}")
-
-            if self.banner is not None:
-                self.banner.set_revealed(False)
-                self.banner = None
+            # NumPy se importa aquí, fuera del hilo principal, antes de que la gráfica lo necesite
+            time_series_chart.numpy_module()
+            start = repo.position()
+            if repo.can_read_columns_fast():
+                # Con los datos ya en memoria o en la caché binaria la carga es inmediata, no hace falta progreso
+                columns = repo.read_columns()
+                series = time_series_chart.TimeSeries.from_buffers(columns.ordinals, columns.values)
+                GLib.idle_add(self._on_load_finished, generation, path, series, self._loaded_position(repo, start))
+                return
+
+            if repo.has_fast_extents():
+                # Con los extremos disponibles al instante los ejes quedan fijos desde el inicio
+                extents = repo.extents()
+                GLib.idle_add(self._on_extents_loaded, generation, extents)
+                if extents is not None and repo.count() > weight_repository.CHUNK_SIZE:
+                    self._load_windows(generation, path, repo, extents, start)
+                    return
 
+            pending = time_series_chart.TimeSeries()
+            last_post = time.monotonic()
+            for chunk in repo.iter_chunks():
+                pending.extend(chunk)
+                # Se agrupan los bloques para no redibujar la gráfica por cada uno
+                if time.monotonic() - last_post >= PROGRESS_INTERVAL:
+                    GLib.idle_add(self._on_chunk_loaded, generation, pending)
+                    pending = time_series_chart.TimeSeries()
+                    last_post = time.monotonic()
+            GLib.idle_add(self._on_load_finished, generation, path, pending, self._loaded_position(repo, start))
         except Exception as e:
-            logger.error(f"Error al cargar datos: {e}")
+            GLib.idle_add(self._on_load_failed, generation, e)
+
+    def _load_windows(
+            self,
+            generation: int,
+            path: pathlib.Path,
+            repo: weight_repository.WeightRepository,
+            extents: weight_repository.WeightExtents,
+            start: weight_repository.FilePosition | None
+    ) -> None:
+        # El backend responde por rangos: primero el tramo más reciente, que es el que se mira,
+        # y luego el historial hacia atrás en ventanas que se duplican para no fusionar demasiadas veces
+        first, end = extents.date_min.toordinal(), extents.date_max.toordinal()
+        days = LOAD_WINDOW_DAYS
+        while generation == self._load_generation:
+            window_start = max(end - days + 1, first)
+            records = repo.get_range(datetime.date.fromordinal(window_start), datetime.date.fromordinal(end))
+            GLib.idle_add(self._on_chunk_loaded, generation, time_series_chart.TimeSeries.from_records(records))
+            if window_start == first:
+                break
+            end = window_start - 1
+            days *= 2
+        GLib.idle_add(
+            self._on_load_finished, generation, path, time_series_chart.TimeSeries(), self._loaded_position(repo, start)
+        )
+
+    @staticmethod
+    def _loaded_position(
+            repo: weight_repository.WeightRepository,
+            start: weight_repository.FilePosition | None
+    ) -> weight_repository.FilePosition | None:
+        # Si el archivo cambió durante la lectura no se sabe qué filas entraron: el próximo cambio recarga todo
+        end = repo.position()
+        return end if end == start else None
+
+    def _on_extents_loaded(self, generation: int, extents: weight_repository.WeightExtents | None) -> bool:
+        if generation == self._load_generation and extents is not None:
+            self.chart.set_extents(time_series_chart.DataExtents(
+                min_val=extents.weight_min,
+                max_val=extents.weight_max,
+                date_min=extents.date_min,
+                date_max=extents.date_max,
+            ))
+        return GLib.SOURCE_REMOVE
+
+    def _on_chunk_loaded(self, generation: int, batch: time_series_chart.TimeSeries) -> bool:
+        if generation == self._load_generation:
+            self.chart.insert_entries(batch)
+        return GLib.SOURCE_REMOVE
+
+    def _on_load_finished(
+            self,
+            generation: int,
+            path: pathlib.Path,
+            batch: time_series_chart.TimeSeries,
+            position: weight_repository.FilePosition | None = None
+    ) -> bool:
+        if generation != self._load_generation:
+            return GLib.SOURCE_REMOVE
+
+        self.chart.insert_entries(batch)
+        self.chart.set_loading(False)
+        self._file_position = position
+        self.chart.profiler.record("load", (time.perf_counter() - self._load_started) * 1000)
+        logger.info("✅ Datos cargados: %d registros desde %s", len(self.chart.entries), path)
 
+        if self.banner is not None:
+            self.banner.set_revealed(False)
+            self.banner = None
+
+        if self._changed_while_loading:
+            self._changed_while_loading = False
+            self._schedule_reload()
+        return GLib.SOURCE_REMOVE
+
+    def _on_load_failed(self, generation: int, error: Exception) -> bool:
+        if generation == self._load_generation:
+            self.chart.set_loading(False)
+            logger.error(f"Error al cargar datos: {error}")
+        return GLib.SOURCE_REMOVE
 
     def on_add_weight_clicked(self, button: Gtk.Button) -> None:
-        def on_save(date: str | datetime.date, weight: float) -> None:
-            entry = time_series_chart.TimeSeriesEntry.from_str(date, weight)
-            if not entry:
-                return
-            self.chart.entries.append(entry)
-            self.chart.entries.sort(key=lambda x: x.date)
-
-            if self.current_file_path:
-                current_date = datetime.datetime.now().date()
-                if isinstance(date, datetime.date):
-                    current_date = date
-                else:
-                    current_date = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-                weight_repository.FileCsvWeightRepository(self.current_file_path).insert(
-                    weight=weight,
-                    date=current_date,
-                )
-                logger.info(f"➕ Peso guardado: {date} - {weight} kg")
-
-        dialog = add_weight_dialog.AddWeightDialog(parent=self, on_save=on_save)
+        # Los diálogos se importan al abrirse para no retrasar el arranque
+        from health_control_chackra.dialog import add_weight_dialog
+
+        dialog = add_weight_dialog.AddWeightDialog(parent=self, on_save=self.save_weight)
         dialog.present()
 
+    def save_weight(self, date: str | datetime.date, weight: float) -> None:
+        entry = time_series_chart.TimeSeriesEntry.from_str(date, weight)
+        if not entry:
+            return
+        self.chart.insert_entry(entry)
+
+        # El repositorio se asigna al empezar la carga: lo añadido mientras se lee también se guarda
+        if self.repository is not None:
+            if self.writer is None:
+                self.writer = self.repository.writer()
+            self.writer.write(entry.date, weight)
+            self._own_records[(entry.date, entry.value)] += 1
+            self._schedule_flush()
+            logger.info(f"➕ Peso guardado: {date} - {weight} kg")
+
+    def _schedule_flush(self) -> None:
+        # Varias entradas seguidas se escriben juntas en un solo flush
+        if self._flush_source is None:
+            self._flush_source = GLib.timeout_add_seconds(FLUSH_DELAY_SECONDS, self._on_flush_timeout)
+
+    def _on_flush_timeout(self) -> bool:
+        self._flush_source = None
+        if self.writer is not None:
+            try:
+                self.writer.flush()
+            except OSError as e:
+                # Los pesos siguen pendientes en el escritor y se vuelven a intentar más tarde
+                logger.error(f"Error al guardar pesos en {self.current_file_path}: {e}")
+                self._schedule_flush()
+        return GLib.SOURCE_REMOVE
+
+    def _close_writer(self) -> None:
+        if self._flush_source is not None:
+            GLib.source_remove(self._flush_source)
+            self._flush_source = None
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except OSError as e:
+                logger.error(f"Error al guardar pesos en {self.current_file_path}: {e}")
+            self.writer = None
+
+    def _watch_file(self, path: pathlib.Path) -> None:
+        if self.monitor is not None:
+            self.monitor.cancel()
+        self.monitor = Gio.File.new_for_path(str(path)).monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        self.monitor.connect("changed", self.on_file_changed)
+
+    def on_file_changed(
+            self,
+            _monitor: Gio.FileMonitor,
+            _file: Gio.File,
+            _other_file: Gio.File | None,
+            event_type: Gio.FileMonitorEvent
+    ) -> None:
+        if event_type in (
+                Gio.FileMonitorEvent.CHANGED,
+                Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+                Gio.FileMonitorEvent.CREATED,
+                Gio.FileMonitorEvent.MOVED_IN,
+                Gio.FileMonitorEvent.RENAMED,
+        ):
+            self._schedule_reload()
+
+    def _schedule_reload(self) -> None:
+        # Una escritura externa genera varios eventos seguidos: se atienden todos de una vez
+        if self._reload_source is None:
+            self._reload_source = GLib.timeout_add(RELOAD_DELAY_MS, self._on_reload_timeout)
+
+    def _on_reload_timeout(self) -> bool:
+        self._reload_source = None
+        self.apply_file_changes()
+        return GLib.SOURCE_REMOVE
+
+    def apply_file_changes(self) -> None:
+        if self.repository is None or self.current_file_path is None:
+            return
+        if self.chart.loading:
+            self._changed_while_loading = True
+            return
+
+        result = self.repository.read_since(self._file_position) if self._file_position is not None else None
+        if result is None:
+            # Archivo truncado, reescrito o sin posición conocida
+            logger.info("🔄 Archivo modificado, recargando: %s", self.current_file_path)
+            self.load_data_from_path(self.current_file_path)
+            return
+
+        records, self._file_position = result
+        external = []
+        for record in records:
+            if self._own_records[record] > 0:
+                self._own_records[record] -= 1
+            else:
+                external.append(record)
+        if external:
+            self.chart.insert_entries(time_series_chart.TimeSeries.from_records(external))
+            logger.info("📥 %d registros nuevos en %s", len(external), self.current_file_path)
+
+    def on_close_request(self, _window: Adw.ApplicationWindow) -> bool:
+        self._close_writer()
+        if self.monitor is not None:
+            self.monitor.cancel()
+            self.monitor = None
+        return False
+
     def on_configure_clicked(self) -> None:
         def on_save(file_path: str) -> None:
             path = pathlib.Path(file_path)
@@ -153,6 +373,8 @@ class MainWindow(Adw.ApplicationWindow):
             repo.save(path)
             self.load_data_from_path(path)
 
+        from health_control_chackra.dialog import configuration_dialog
+
         dialog = configuration_dialog.ConfigurationDialog(
             parent=self,
             on_save=on_save,
@@ -0,0 +1,72 @@
+import unittest
+from health_control_chackra.chart import downsample as subject
+
+
+class TestMinMaxIndices(unittest.TestCase):
+    def test_min_max_indices_keeps_extremes_per_column(self):
+        xs = [0.0, 0.2, 0.5, 0.8, 1.1, 1.5, 1.9]
+        ys = [5.0, 1.0, 9.0, 4.0, 3.0, 7.0, 2.0]
+        result = subject.min_max_indices(xs, ys)
+        self.assertEqual(result, [0, 1, 2, 5, 6])
+
+    def test_min_max_indices_keeps_endpoints(self):
+        xs = [0.0, 0.1, 0.2, 0.3]
+        ys = [2.0, 1.0, 3.0, 2.0]
+        result = subject.min_max_indices(xs, ys)
+        self.assertEqual(result[0], 0)
+        self.assertEqual(result[-1], 3)
+
+    def test_min_max_indices_short_series(self):
+        self.assertEqual(subject.min_max_indices([], []), [])
+        self.assertEqual(subject.min_max_indices([1.0, 2.0], [3.0, 4.0]), [0, 1])
+
+
+class TestLttbIndices(unittest.TestCase):
+    def test_lttb_indices_returns_threshold_points(self):
+        xs = [float(i) for i in range(100)]
+        ys = [float(i % 10) for i in range(100)]
+        result = subject.lttb_indices(xs, ys, 20)
+        self.assertEqual(len(result), 20)
+        self.assertEqual(result[0], 0)
+        self.assertEqual(result[-1], 99)
+        self.assertEqual(result, sorted(result))
+
+    def test_lttb_indices_keeps_spike(self):
+        xs = [float(i) for i in range(50)]
+        ys = [0.0] * 50
+        ys[25] = 100.0
+        self.assertIn(25, subject.lttb_indices(xs, ys, 10))
+
+    def test_lttb_indices_threshold_above_length(self):
+        self.assertEqual(subject.lttb_indices([0.0, 1.0, 2.0], [0.0, 1.0, 2.0], 10), [0, 1, 2])
+
+
+class TestDownsample(unittest.TestCase):
+    def test_downsample_does_nothing_below_target(self):
+        xs, ys = [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]
+        self.assertEqual(subject.downsample(xs, ys, plot_width=100), (xs, ys))
+
+    def test_downsample_reduces_to_about_twice_the_width(self):
+        n = 10_000
+        xs = [100 + 50 * i / n for i in range(n)]
+        ys = [float(i % 7) for i in range(n)]
+        for method in (subject.MINMAX, subject.LTTB):
+            dxs, dys = subject.downsample(xs, ys, plot_width=50, method=method)
+            self.assertLessEqual(len(dxs), 2 * 50 + 2)
+            self.assertEqual(len(dxs), len(dys))
+            self.assertEqual((dxs[0], dxs[-1]), (xs[0], xs[-1]))
+
+    def test_downsample_unknown_method(self):
+        with self.assertRaises(ValueError):
+            subject.downsample([0.0] * 10, [0.0] * 10, plot_width=1, method="unknown")
+
+
+class TestMarkerStep(unittest.TestCase):
+    def test_marker_step_sparse_series_draws_all(self):
+        self.assertEqual(subject.marker_step(count=10, plot_width=640), 1)
+
+    def test_marker_step_medium_density_thins_out(self):
+        self.assertEqual(subject.marker_step(count=160, plot_width=640), 2)
+
+    def test_marker_step_dense_series_hides_markers(self):
+        self.assertEqual(subject.marker_step(count=1000, plot_width=640), 0)
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+from health_control_chackra.chart import profiling as subject
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = subject.FrameProfiler(history_size=3)
+
+    def test_disabled_profiler_records_nothing(self):
+        self.assertFalse(self.profiler.enabled)
+        self.profiler.begin_frame()
+        start = self.profiler.start()
+        self.assertEqual(start, 0.0)
+        self.assertEqual(self.profiler.lap("grid", start), 0.0)
+        self.profiler.record_since("hit_test", start)
+        self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.frames), 0)
+        self.assertEqual(self.profiler.events, {})
+
+    @patch("health_control_chackra.chart.profiling.time.perf_counter")
+    def test_frame_phases_are_accumulated(self, perf_counter):
+        perf_counter.side_effect = [1.0, 1.0, 1.002, 1.005, 1.006, 1.010]
+        self.profiler.toggle_overlay()
+        self.profiler.begin_frame()
+        start = self.profiler.start()
+        start = self.profiler.lap("grid", start)
+        start = self.profiler.lap("labels", start)
+        self.profiler.lap("grid", start)
+        self.profiler.end_frame()
+
+        frame = self.profiler.frames[-1]
+        self.assertAlmostEqual(frame["grid"], 3.0)
+        self.assertAlmostEqual(frame["labels"], 3.0)
+        self.assertAlmostEqual(frame["total"], 10.0)
+
+    def test_listeners_receive_frames_and_enable_profiling(self):
+        received = []
+        self.profiler.add_listener(received.append)
+        self.assertTrue(self.profiler.enabled)
+        self.profiler.begin_frame()
+        self.profiler.lap("line", self.profiler.start())
+        self.profiler.end_frame()
+        self.assertEqual(len(received), 1)
+        self.assertIn("line", received[0])
+
+        self.profiler.remove_listener(received.append)
+        self.assertFalse(self.profiler.enabled)
+
+    def test_history_is_bounded(self):
+        self.profiler.toggle_overlay()
+        for _ in range(5):
+            self.profiler.begin_frame()
+            self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.frames), 3)
+
+    def test_summary_includes_phases_and_events(self):
+        self.profiler.frames.append({"grid": 1.0, "total": 2.0})
+        self.profiler.frames.append({"total": 4.0})
+        self.profiler.record("load", 120.0)
+        lines = self.profiler.summary_lines()
+        self.assertTrue(any(line.startswith("grid") and "0.50ms" in line for line in lines))
+        self.assertTrue(any(line.startswith("total") and "3.00ms" in line for line in lines))
+        self.assertTrue(any(line.startswith("load") and "120.00ms" in line for line in lines))
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+from health_control_chackra.chart import pyramid as subject
+
+
+def rows(level):
+    return list(zip(level.keys, level.counts, level.sums, level.lows, level.highs))
+
+
+class TestBuckets(unittest.TestCase):
+    def test_week_bucket_starts_on_monday(self):
+        wednesday = date(2025, 9, 3).toordinal()
+        self.assertEqual(subject.week_bucket(wednesday), date(2025, 9, 1).toordinal())
+        self.assertEqual(subject.week_bucket(date(2025, 9, 1).toordinal()), date(2025, 9, 1).toordinal())
+
+    def test_month_bucket_starts_on_first_day(self):
+        self.assertEqual(subject.month_bucket(date(2025, 2, 28).toordinal()), date(2025, 2, 1).toordinal())
+
+
+class TestAggregatePyramid(unittest.TestCase):
+    def setUp(self):
+        self.ordinals = [
+            date(2025, 8, 30).toordinal(),
+            date(2025, 9, 1).toordinal(),
+            date(2025, 9, 1).toordinal(),
+            date(2025, 9, 3).toordinal(),
+            date(2025, 9, 10).toordinal(),
+        ]
+        self.values = [70.0, 72.0, 74.0, 71.0, 69.0]
+
+    def test_from_columns_aggregates_each_level(self):
+        result = subject.AggregatePyramid.from_columns(self.ordinals, self.values)
+        daily, weekly, monthly = result.levels
+        self.assertEqual(rows(daily), [
+            (date(2025, 8, 30).toordinal(), 1, 70.0, 70.0, 70.0),
+            (date(2025, 9, 1).toordinal(), 2, 146.0, 72.0, 74.0),
+            (date(2025, 9, 3).toordinal(), 1, 71.0, 71.0, 71.0),
+            (date(2025, 9, 10).toordinal(), 1, 69.0, 69.0, 69.0),
+        ])
+        self.assertEqual(rows(weekly), [
+            (date(2025, 8, 25).toordinal(), 1, 70.0, 70.0, 70.0),
+            (date(2025, 9, 1).toordinal(), 3, 217.0, 71.0, 74.0),
+            (date(2025, 9, 8).toordinal(), 1, 69.0, 69.0, 69.0),
+        ])
+        self.assertEqual(rows(monthly), [
+            (date(2025, 8, 1).toordinal(), 1, 70.0, 70.0, 70.0),
+            (date(2025, 9, 1).toordinal(), 4, 286.0, 69.0, 74.0),
+        ])
+
+    def test_from_columns_pure_python_fallback(self):
+        with patch.object(subject, "numpy_module", lambda: None):
+            fallback = subject.AggregatePyramid.from_columns(self.ordinals, self.values)
+        expected = subject.AggregatePyramid.from_columns(self.ordinals, self.values)
+        for level, other in zip(fallback.levels, expected.levels):
+            self.assertEqual(rows(level), rows(other))
+
+    def test_add_matches_rebuild(self):
+        result = subject.AggregatePyramid.from_columns(self.ordinals[1:], self.values[1:])
+        # Un dato anterior a todos, uno en un cubo existente y uno al final
+        result.add(self.ordinals[0], self.values[0])
+        result.add(date(2025, 9, 1).toordinal(), 80.0)
+        result.add(date(2025, 10, 5).toordinal(), 68.0)
+
+        expected = subject.AggregatePyramid.from_columns(
+            self.ordinals[:3] + [date(2025, 9, 1).toordinal()] + self.ordinals[3:] + [date(2025, 10, 5).toordinal()],
+            self.values[:3] + [80.0] + self.values[3:] + [68.0],
+        )
+        for level, other in zip(result.levels, expected.levels):
+            self.assertEqual(rows(level), rows(other))
+
+    def test_means_and_centers(self):
+        weekly = subject.AggregatePyramid.from_columns(self.ordinals, self.values).level(subject.WEEK)
+        window = range(1, 2)
+        self.assertEqual(weekly.means(window), [217.0 / 3])
+        self.assertEqual(weekly.centers(window), [date(2025, 9, 4).toordinal()])
+
+    def test_window_pads_one_bucket_each_side(self):
+        daily = subject.AggregatePyramid.from_columns(self.ordinals, self.values).level(subject.DAY)
+        window = daily.window(date(2025, 9, 2).toordinal(), date(2025, 9, 4).toordinal())
+        self.assertEqual(window, range(1, 4))
+
+    def test_level_for_picks_coarsest_level_with_a_bucket_per_pixel(self):
+        start = date(2020, 1, 1).toordinal()
+        result = subject.AggregatePyramid.from_columns(range(start, start + 1000), [70.0] * 1000)
+        self.assertEqual(result.level_for(start, start + 999, 30).name, subject.MONTH)
+        self.assertEqual(result.level_for(start, start + 999, 100).name, subject.WEEK)
+        self.assertEqual(result.level_for(start, start + 999, 500).name, subject.DAY)
+        self.assertIsNone(result.level_for(start, start + 999, 2000))
@@ -0,0 +1,64 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+from health_control_chackra.chart import statistics as subject
+
+
+class TestRollingStatistics(unittest.TestCase):
+    def setUp(self):
+        start = date(2025, 1, 1).toordinal()
+        self.ordinals = [start + 2 * i for i in range(20)]
+        self.values = [80.0 - 0.1 * i + (i % 3) for i in range(20)]
+
+    def naive_sma(self, window):
+        return [
+            sum(self.values[max(0, i + 1 - window):i + 1]) / len(self.values[max(0, i + 1 - window):i + 1])
+            for i in range(len(self.values))
+        ]
+
+    def test_sma_matches_naive_window(self):
+        stats = subject.RollingStatistics.from_columns(self.ordinals, self.values, window=4)
+        for got, expected in zip(stats.sma, self.naive_sma(4)):
+            self.assertAlmostEqual(got, expected)
+
+    def test_ema_follows_recurrence(self):
+        stats = subject.RollingStatistics.from_columns(self.ordinals, self.values, span=3)
+        self.assertEqual(stats.ema[0], self.values[0])
+        for i in range(1, len(self.values)):
+            self.assertAlmostEqual(stats.ema[i], stats.ema[i - 1] + 0.5 * (self.values[i] - stats.ema[i - 1]))
+
+    def test_trend_fits_a_line(self):
+        start = date(2025, 1, 1).toordinal()
+        stats = subject.RollingStatistics.from_columns(range(start, start + 10), [70.0 + 0.5 * i for i in range(10)])
+        slope, intercept = stats.trend()
+        self.assertAlmostEqual(slope, 0.5)
+        self.assertAlmostEqual(intercept, 70.0)
+        self.assertAlmostEqual(stats.trend_at(start + 20), 80.0)
+
+    def test_trend_needs_two_distinct_dates(self):
+        self.assertIsNone(subject.RollingStatistics().trend())
+        stats = subject.RollingStatistics.from_columns([10, 10], [1.0, 2.0])
+        self.assertIsNone(stats.trend_at(10))
+
+    def test_append_matches_batch_build(self):
+        stats = subject.RollingStatistics.from_columns(self.ordinals[:12], self.values[:12], window=5)
+        for ordinal, value in zip(self.ordinals[12:], self.values[12:]):
+            stats.append(ordinal, value)
+        expected = subject.RollingStatistics.from_columns(self.ordinals, self.values, window=5)
+        self.assertEqual(len(stats), len(expected))
+        for got, want in zip(stats.sma, expected.sma):
+            self.assertAlmostEqual(got, want)
+        for got, want in zip(stats.ema, expected.ema):
+            self.assertAlmostEqual(got, want)
+        for got, want in zip(stats.trend(), expected.trend()):
+            self.assertAlmostEqual(got, want)
+
+    def test_pure_python_fallback_matches(self):
+        with patch.object(subject, "numpy_module", lambda: None):
+            fallback = subject.RollingStatistics.from_columns(self.ordinals, self.values)
+        expected = subject.RollingStatistics.from_columns(self.ordinals, self.values)
+        for got, want in zip(fallback.sma, expected.sma):
+            self.assertAlmostEqual(got, want)
+        self.assertEqual(list(fallback.ema), list(expected.ema))
+        for got, want in zip(fallback.trend(), expected.trend()):
+            self.assertAlmostEqual(got, want)
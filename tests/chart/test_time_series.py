@@ -0,0 +1,119 @@
+import unittest
+from datetime import date
+from health_control_chackra.chart import time_series as subject
+
+
+class TestTimeSeries(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 3), 74.0),
+            (date(2025, 9, 1), 72.0),
+            (date(2025, 9, 2), 70.0),
+        ])
+
+    def test_time_series_from_records_is_sorted(self):
+        self.assertEqual(
+            list(self.series.ordinals),
+            [date(2025, 9, 1).toordinal(), date(2025, 9, 2).toordinal(), date(2025, 9, 3).toordinal()],
+        )
+        self.assertEqual(list(self.series.values), [72.0, 70.0, 74.0])
+
+    def test_time_series_uses_compact_arrays(self):
+        self.assertEqual(self.series.ordinals.typecode, "i")
+        self.assertEqual(self.series.values.typecode, "d")
+
+    def test_time_series_getitem_returns_entry_view(self):
+        entry = self.series[1]
+        self.assertIsInstance(entry, subject.TimeSeriesEntry)
+        self.assertEqual(entry, subject.TimeSeriesEntry(date=date(2025, 9, 2), value=70.0))
+        self.assertEqual(self.series[-1].date, date(2025, 9, 3))
+
+    def test_time_series_slice_returns_series(self):
+        head = self.series[:2]
+        self.assertIsInstance(head, subject.TimeSeries)
+        self.assertEqual(len(head), 2)
+        self.assertEqual(head.date_max, date(2025, 9, 2))
+
+    def test_time_series_iteration(self):
+        self.assertEqual([e.value for e in self.series], [72.0, 70.0, 74.0])
+
+    def test_time_series_date_range(self):
+        self.assertEqual(self.series.date_min, date(2025, 9, 1))
+        self.assertEqual(self.series.date_max, date(2025, 9, 3))
+
+    def test_time_series_copy_is_independent(self):
+        copy = self.series.copy()
+        copy.append(date(2025, 9, 4), 75.0)
+        self.assertEqual(len(copy), 4)
+        self.assertEqual(len(self.series), 3)
+
+    def test_time_series_empty(self):
+        series = subject.TimeSeries()
+        self.assertFalse(series)
+        self.assertEqual(len(series), 0)
+        self.assertTrue(series.is_sorted())
+
+    def test_time_series_mismatched_columns(self):
+        with self.assertRaises(ValueError):
+            subject.TimeSeries([1, 2], [70.0])
+
+    def test_time_series_from_entries(self):
+        series = subject.TimeSeries.from_entries([
+            subject.TimeSeriesEntry(date=date(2025, 9, 2), value=70.0),
+            subject.TimeSeriesEntry(date=date(2025, 9, 1), value=72.0),
+        ])
+        self.assertEqual(series.date_min, date(2025, 9, 1))
+        self.assertEqual(list(series.values), [72.0, 70.0])
+
+    def test_time_series_insert_keeps_order(self):
+        index = self.series.insert(date(2025, 9, 2), 71.0)
+        self.assertEqual(index, 2)
+        self.assertEqual(list(self.series.values), [72.0, 70.0, 71.0, 74.0])
+        self.assertTrue(self.series.is_sorted())
+
+    def test_time_series_insert_at_edges(self):
+        self.assertEqual(self.series.insert(date(2025, 8, 31), 69.0), 0)
+        self.assertEqual(self.series.insert(date(2025, 9, 30), 75.0), 4)
+        self.assertEqual(self.series.date_min, date(2025, 8, 31))
+        self.assertEqual(self.series.date_max, date(2025, 9, 30))
+
+    def test_time_series_merge_interleaved_batch(self):
+        batch = subject.TimeSeries.from_records([(date(2025, 8, 30), 60.0), (date(2025, 9, 2), 61.0)])
+        self.series.merge(batch)
+        self.assertTrue(self.series.is_sorted())
+        self.assertEqual(list(self.series.values), [60.0, 72.0, 70.0, 61.0, 74.0])
+
+    def test_time_series_merge_appends_in_place(self):
+        ordinals = self.series.ordinals
+        batch = subject.TimeSeries.from_records([(date(2025, 9, 5), 76.0)])
+        self.series.merge(batch)
+        self.assertIs(self.series.ordinals, ordinals)
+        self.assertEqual(self.series[-1].value, 76.0)
+
+    def test_time_series_merge_empty_batch(self):
+        self.series.merge(subject.TimeSeries())
+        self.assertEqual(len(self.series), 3)
+
+    def test_time_series_from_buffers_shares_memory(self):
+        ordinals = memoryview(self.series.ordinals.tobytes()).cast("i")
+        values = memoryview(self.series.values.tobytes()).cast("d")
+        shared = subject.TimeSeries.from_buffers(ordinals, values)
+        self.assertIs(shared.ordinals, ordinals)
+        self.assertTrue(shared.is_shared)
+        self.assertEqual(shared[1].value, 70.0)
+
+    def test_time_series_shared_copies_on_first_write(self):
+        ordinals = memoryview(self.series.ordinals.tobytes()).cast("i")
+        values = memoryview(self.series.values.tobytes()).cast("d")
+        shared = subject.TimeSeries.from_buffers(ordinals, values)
+        shared.insert(date(2025, 9, 4), 75.0)
+        self.assertFalse(shared.is_shared)
+        self.assertEqual(list(shared.values), [72.0, 70.0, 74.0, 75.0])
+        self.assertEqual(len(values), 3)
+
+    def test_time_series_merge_into_empty_adopts_shared_buffers(self):
+        ordinals = memoryview(self.series.ordinals.tobytes()).cast("i")
+        values = memoryview(self.series.values.tobytes()).cast("d")
+        series = subject.TimeSeries()
+        series.merge(subject.TimeSeries.from_buffers(ordinals, values))
+        self.assertIs(series.values, values)
@@ -233,6 +233,37 @@ class TestCreateLayout(unittest.TestCase):
         self.assertTrue(font_desc.get_weight() != Pango.Weight.BOLD)
 
 
+class TestLayoutCache(unittest.TestCase):
+    def setUp(self):
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 100, 100)
+        self.cr = cairo.Context(self.surface)
+        self.cache = subject.LayoutCache(max_size=2)
+
+    def test_layout_cache_reuses_layout_for_same_key(self):
+        first = self.cache.get(self.cr, "Testing", 12)
+        self.assertIs(self.cache.get(self.cr, "Testing", 12), first)
+        self.assertEqual(first.get_text(), "Testing")
+
+    def test_layout_cache_distinguishes_size_and_weight(self):
+        regular = self.cache.get(self.cr, "Testing", 12)
+        self.assertIsNot(self.cache.get(self.cr, "Testing", 14), regular)
+        self.assertIsNot(self.cache.get(self.cr, "Testing", 12, bold=True), regular)
+
+    def test_layout_cache_evicts_least_recently_used(self):
+        first = self.cache.get(self.cr, "first", 10)
+        self.cache.get(self.cr, "second", 10)
+        self.cache.get(self.cr, "first", 10)
+        self.cache.get(self.cr, "third", 10)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(self.cache.get(self.cr, "first", 10), first)
+
+    def test_layout_cache_clear(self):
+        first = self.cache.get(self.cr, "Testing", 12)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNot(self.cache.get(self.cr, "Testing", 12), first)
+
+
 class TestChartConfig(unittest.TestCase):
     def test_chart_config_default_values(self):
         config = subject.ChartConfig()
@@ -292,3 +323,471 @@ class TestValueToY(unittest.TestCase):
         result = subject.value_to_y(value=50, margin_top=20, plot_height=1000, min_val=0, max_val=100)
         expected = 520  # Testing with a larger plot height
         self.assertAlmostEqual(result, expected)
+
+
+class TestHitTestIndex(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 70.0),
+            (date(2025, 9, 11), 71.0),
+            (date(2025, 9, 21), 72.0),
+            (date(2025, 10, 1), 73.0),
+        ])
+        self.index = subject.HitTestIndex(self.series)
+
+    def test_hit_test_index_date_range(self):
+        self.assertEqual(self.index.ordinal_min, date(2025, 9, 1).toordinal())
+        self.assertEqual(self.index.days_total, 30)
+
+    def test_hit_test_index_candidates_near_point(self):
+        # 300px para 30 días: cada entrada está separada 100px
+        result = self.index.candidates(x=200, radius=15, margin_left=100, plot_width=300)
+        self.assertEqual(list(result), [1])
+
+    def test_hit_test_index_candidates_outside_plot(self):
+        result = self.index.candidates(x=1000, radius=15, margin_left=100, plot_width=300)
+        self.assertEqual(list(result), [])
+
+    def test_hit_test_index_candidates_without_plot_width(self):
+        result = self.index.candidates(x=200, radius=15, margin_left=100, plot_width=0)
+        self.assertEqual(list(result), [0, 1, 2, 3])
+
+    def test_hit_test_index_empty_entries(self):
+        index = subject.HitTestIndex(subject.TimeSeries())
+        self.assertEqual(list(index.candidates(x=200, radius=15, margin_left=100, plot_width=300)), [])
+
+
+class TestChartGeometry(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 72.0),
+            (date(2025, 9, 2), 70.0),
+            (date(2025, 9, 3), 74.0),
+        ])
+        self.geometry = subject.ChartGeometry()
+
+    def test_plot_area_uses_margins(self):
+        area = self.geometry.plot_area(800, 500)
+        self.assertEqual(area, subject.PlotArea(margin_left=100, margin_top=80, width=640, height=340))
+
+    def test_plot_area_is_cached_per_size(self):
+        first = self.geometry.plot_area(800, 500)
+        self.assertIs(self.geometry.plot_area(800, 500), first)
+        self.assertIsNot(self.geometry.plot_area(900, 500), first)
+
+    def test_extents_are_computed_once(self):
+        extents = self.geometry.extents(self.series)
+        self.assertEqual(extents.min_val, 70.0)
+        self.assertEqual(extents.max_val, 74.0)
+        self.assertEqual(extents.date_min, date(2025, 9, 1))
+        self.assertEqual(extents.date_max, date(2025, 9, 3))
+        self.assertIs(self.geometry.extents(subject.TimeSeries()), extents)
+
+    def test_extents_include_base_extents(self):
+        self.geometry.base_extents = subject.DataExtents(
+            min_val=60.0, max_val=72.0, date_min=date(2025, 8, 1), date_max=date(2025, 9, 2),
+        )
+        self.geometry.invalidate_data()
+        extents = self.geometry.extents(self.series)
+        self.assertEqual(extents.min_val, 60.0)
+        self.assertEqual(extents.max_val, 74.0)
+        self.assertEqual(extents.date_min, date(2025, 8, 1))
+        self.assertEqual(extents.date_max, date(2025, 9, 3))
+
+    def test_invalidate_data_recomputes_extents(self):
+        self.geometry.extents(self.series)
+        self.geometry.hit_index(self.series)
+        self.geometry.invalidate_data()
+        extents = self.geometry.extents(self.series[:1])
+        self.assertEqual(extents.max_val, 72.0)
+        self.assertEqual(len(self.geometry.hit_index(self.series[:1]).ordinals), 1)
+
+
+class TestProjectSeries(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 70.0),
+            (date(2025, 9, 16), 75.0),
+            (date(2025, 10, 1), 80.0),
+        ])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=300, height=200)
+        self.extents = subject.DataExtents.from_series(self.series)
+
+    def expected(self):
+        xs = [
+            subject.map_date_to_x_coordinate(e.date, 100, 300, self.extents.date_min, self.extents.date_max)
+            for e in self.series
+        ]
+        ys = [
+            subject.value_to_y(e.value, 80, 200, self.extents.min_val, self.extents.max_val)
+            for e in self.series
+        ]
+        return xs, ys
+
+    def test_project_series_matches_scalar_helpers(self):
+        xs, ys = subject.project_series(self.series, self.area, self.extents)
+        expected_xs, expected_ys = self.expected()
+        self.assertEqual(xs, expected_xs)
+        self.assertEqual(ys, expected_ys)
+
+    @patch("health_control_chackra.chart.time_series_chart.numpy_module", lambda: None)
+    def test_project_series_pure_python_fallback(self):
+        xs, ys = subject.project_series(self.series, self.area, self.extents)
+        expected_xs, expected_ys = self.expected()
+        self.assertEqual(xs, expected_xs)
+        self.assertEqual(ys, expected_ys)
+
+    def test_project_series_empty(self):
+        self.assertEqual(subject.project_series(subject.TimeSeries(), self.area, self.extents), ([], []))
+
+    def test_geometry_projection_is_cached_per_area(self):
+        geometry = subject.ChartGeometry()
+        first = geometry.projection(self.series, self.area)
+        self.assertIs(geometry.projection(self.series, self.area), first)
+        geometry.invalidate_data()
+        self.assertIsNot(geometry.projection(self.series, self.area), first)
+
+    def test_geometry_decimated_is_cached_per_area_and_method(self):
+        geometry = subject.ChartGeometry()
+        first = geometry.decimated(self.series, self.area, subject.downsample.MINMAX)
+        self.assertIs(geometry.decimated(self.series, self.area, subject.downsample.MINMAX), first)
+        self.assertIsNot(geometry.decimated(self.series, self.area, None), first)
+
+    def test_geometry_decimated_without_method_returns_projection(self):
+        geometry = subject.ChartGeometry()
+        self.assertEqual(geometry.decimated(self.series, self.area, None), geometry.projection(self.series, self.area))
+
+
+class TestLayerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = subject.LayerCache()
+        self.draw = MagicMock()
+
+    def test_layer_cache_draws_once_per_key(self):
+        first = self.cache.get((False, 1), 80, 50, 1, self.draw)
+        second = self.cache.get((False, 1), 80, 50, 1, self.draw)
+        self.assertIs(first, second)
+        self.assertIsInstance(first, cairo.ImageSurface)
+        self.draw.assert_called_once()
+
+    def test_layer_cache_redraws_on_resize(self):
+        self.cache.get((False, 1), 80, 50, 1, self.draw)
+        self.cache.get((False, 1), 90, 50, 1, self.draw)
+        self.assertEqual(self.draw.call_count, 2)
+
+    def test_layer_cache_redraws_on_key_change(self):
+        self.cache.get((False, 1), 80, 50, 1, self.draw)
+        self.cache.get((True, 1), 80, 50, 1, self.draw)
+        self.cache.get((True, 2), 80, 50, 1, self.draw)
+        self.assertEqual(self.draw.call_count, 3)
+
+    def test_layer_cache_scales_surface(self):
+        surface = self.cache.get((False, 1), 80, 50, 2, self.draw)
+        self.assertEqual((surface.get_width(), surface.get_height()), (160, 100))
+
+    def test_layer_cache_invalidate(self):
+        self.cache.get((False, 1), 80, 50, 1, self.draw)
+        self.cache.invalidate()
+        self.cache.get((False, 1), 80, 50, 1, self.draw)
+        self.assertEqual(self.draw.call_count, 2)
+
+
+class TestIncrementalGeometry(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 70.0),
+            (date(2025, 9, 11), 75.0),
+            (date(2025, 9, 21), 80.0),
+        ])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=300, height=200)
+        self.geometry = subject.ChartGeometry()
+        self.geometry.projection(self.series, self.area)
+
+    def assert_matches_fresh_geometry(self):
+        fresh = subject.ChartGeometry()
+        self.assertEqual(self.geometry.extents(self.series), fresh.extents(self.series))
+        self.assertEqual(
+            self.geometry.projection(self.series, self.area),
+            fresh.projection(self.series, self.area),
+        )
+
+    def test_entry_inserted_within_extents_keeps_projection(self):
+        projection = self.geometry.projection(self.series, self.area)
+        index = self.series.insert(date(2025, 9, 6), 72.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertIs(self.geometry.projection(self.series, self.area), projection)
+        self.assert_matches_fresh_geometry()
+
+    def test_entry_inserted_outside_extents_updates_them(self):
+        version = self.geometry.data_version
+        index = self.series.insert(date(2025, 10, 1), 90.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertEqual(self.geometry.extents(self.series).max_val, 90.0)
+        self.assertEqual(self.geometry.extents(self.series).date_max, date(2025, 10, 1))
+        self.assertGreater(self.geometry.data_version, version)
+        self.assert_matches_fresh_geometry()
+
+    def test_entries_merged_updates_extents(self):
+        batch = subject.TimeSeries.from_records([(date(2025, 8, 1), 60.0), (date(2025, 9, 15), 77.0)])
+        self.series.merge(batch)
+        self.geometry.entries_merged(self.series, batch)
+        self.assertEqual(self.geometry.extents(self.series).min_val, 60.0)
+        self.assert_matches_fresh_geometry()
+
+
+class TestRangeExtrema(unittest.TestCase):
+    def setUp(self):
+        self.values = [float((i * 37) % 101) for i in range(50)]
+        self.extrema = subject.RangeExtrema(self.values)
+
+    def test_range_extrema_matches_scan(self):
+        for lo in range(0, 50, 3):
+            for hi in range(lo + 1, 51, 5):
+                expected = (min(self.values[lo:hi]), max(self.values[lo:hi]))
+                self.assertEqual(self.extrema.query(lo, hi), expected, (lo, hi))
+
+    def test_range_extrema_single_point(self):
+        self.assertEqual(self.extrema.query(10, 11), (self.values[10], self.values[10]))
+
+    def test_range_extrema_append_grows_capacity(self):
+        self.assertEqual(self.extrema.capacity, 64)
+        for i in range(30):
+            value = float((i * 53) % 97) - 20
+            self.values.append(value)
+            self.extrema.append(value)
+        self.assertEqual(len(self.extrema), 80)
+        self.assertEqual(self.extrema.capacity, 128)
+        for lo in range(0, 80, 7):
+            self.assertEqual(self.extrema.query(lo, 80), (min(self.values[lo:]), max(self.values[lo:])))
+
+    def test_range_extrema_from_empty(self):
+        extrema = subject.RangeExtrema([])
+        for value in (3.0, 1.0, 2.0):
+            extrema.append(value)
+        self.assertEqual(extrema.query(0, 3), (1.0, 3.0))
+        self.assertEqual(extrema.query(2, 3), (2.0, 2.0))
+
+    def test_range_extrema_pure_python_fallback(self):
+        with patch.object(subject, "numpy_module", lambda: None):
+            extrema = subject.RangeExtrema(self.values)
+            extrema.append(-1.0)
+        self.assertEqual(extrema.query(5, 51), (-1.0, max(self.values[5:])))
+        self.assertEqual(extrema.query(3, 17), (min(self.values[3:17]), max(self.values[3:17])))
+
+
+class TestViewport(unittest.TestCase):
+    def test_viewport_clamped_keeps_span(self):
+        self.assertEqual(subject.Viewport(90, 110).clamped(0, 100), subject.Viewport(80, 100))
+        self.assertEqual(subject.Viewport(-5, 15).clamped(0, 100), subject.Viewport(0, 20))
+
+    def test_viewport_zoomed_keeps_anchor(self):
+        viewport = subject.Viewport(0, 100).zoomed(anchor=25, factor=0.5, low=0, high=100)
+        self.assertEqual(viewport, subject.Viewport(12, 62))
+
+    def test_viewport_zoomed_respects_minimum_span(self):
+        viewport = subject.Viewport(0, 10).zoomed(anchor=5, factor=0.1, low=0, high=100)
+        self.assertEqual(viewport.span, subject.MIN_VIEWPORT_DAYS)
+
+    def test_viewport_zoomed_out_to_full_range(self):
+        self.assertIsNone(subject.Viewport(10, 90).zoomed(anchor=50, factor=2, low=0, high=100))
+
+    def test_viewport_panned(self):
+        self.assertEqual(subject.Viewport(10, 30).panned(15, 0, 100), subject.Viewport(25, 45))
+        self.assertEqual(subject.Viewport(10, 30).panned(-50, 0, 100), subject.Viewport(0, 20))
+
+
+class TestViewportGeometry(unittest.TestCase):
+    def setUp(self):
+        start = date(2025, 1, 1).toordinal()
+        self.series = subject.TimeSeries(range(start, start + 100), [70.0 + (i % 10) for i in range(100)])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=300, height=200)
+        self.geometry = subject.ChartGeometry()
+        self.geometry.set_viewport(subject.Viewport(start + 20, start + 24))
+
+    def test_window_bisects_dates(self):
+        self.assertEqual(self.geometry.window(self.series), range(20, 25))
+        self.assertEqual(self.geometry.visible(self.series), range(19, 26))
+
+    def test_extents_cover_viewport(self):
+        extents = self.geometry.extents(self.series)
+        self.assertEqual((extents.min_val, extents.max_val), (70.0, 74.0))
+        self.assertEqual(extents.date_min, date(2025, 1, 21))
+        self.assertEqual(extents.date_max, date(2025, 1, 25))
+
+    def test_projection_only_covers_visible_slice(self):
+        xs, ys = self.geometry.projection(self.series, self.area)
+        self.assertEqual(len(xs), 7)
+        self.assertEqual(xs[1], 100)
+        self.assertEqual(xs[-2], 400)
+
+    def test_set_viewport_invalidates_view(self):
+        version = self.geometry.data_version
+        self.geometry.extents(self.series)
+        self.geometry.set_viewport(None)
+        self.assertGreater(self.geometry.data_version, version)
+        self.assertEqual(self.geometry.extents(self.series).max_val, 79.0)
+        self.assertEqual(len(self.geometry.projection(self.series, self.area)[0]), 100)
+
+    def test_hit_index_uses_viewport_extents(self):
+        index = self.geometry.hit_index(self.series)
+        self.assertEqual(index.ordinal_min, self.geometry.viewport.start)
+        self.assertEqual(index.days_total, 4)
+        # 300px para 4 días: el tercer día visible cae en x=250
+        self.assertIn(22, index.candidates(x=250, radius=15, margin_left=100, plot_width=300))
+
+    def test_entry_inserted_with_viewport_recomputes_extents(self):
+        self.geometry.extents(self.series)
+        index = self.series.insert(date(2025, 1, 23), 90.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertEqual(self.geometry.extents(self.series).max_val, 90.0)
+
+    def test_appended_entries_update_extrema_in_place(self):
+        extrema = self.geometry.range_extrema(self.series)
+        index = self.series.insert(date(2025, 4, 11), 50.0)
+        self.geometry.entry_inserted(self.series, index)
+        batch = subject.TimeSeries.from_records([(date(2025, 4, 12), 95.0)])
+        self.series.merge(batch)
+        self.geometry.entries_merged(self.series, batch, appended=True)
+        self.assertIs(self.geometry.range_extrema(self.series), extrema)
+        self.assertEqual(extrema.query(0, len(self.series)), (50.0, 95.0))
+
+    def test_inserted_entry_in_the_middle_rebuilds_extrema(self):
+        extrema = self.geometry.range_extrema(self.series)
+        index = self.series.insert(date(2025, 1, 22), 10.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertIsNot(self.geometry.range_extrema(self.series), extrema)
+        self.assertEqual(self.geometry.extents(self.series).min_val, 10.0)
+
+
+class TestAggregatedGeometry(unittest.TestCase):
+    def setUp(self):
+        start = date(2020, 1, 1).toordinal()
+        self.series = subject.TimeSeries(range(start, start + 1000), [70.0 + (i % 30) for i in range(1000)])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=100, height=200)
+        self.geometry = subject.ChartGeometry()
+
+    def test_aggregated_uses_coarsest_level(self):
+        xs, means, lows, highs = self.geometry.aggregated(self.series, self.area)
+        # 1000 días desde un miércoles en 100 px: semanas (144 cubos), no meses (33)
+        self.assertEqual(len(xs), 144)
+        self.assertTrue(all(low >= mean >= high for mean, low, high in zip(means, lows, highs)))
+
+    def test_aggregated_none_when_points_are_sparse(self):
+        self.geometry.set_viewport(subject.Viewport(self.series.ordinals[0], self.series.ordinals[0] + 50))
+        self.assertIsNone(self.geometry.aggregated(self.series, self.area))
+
+    def test_entry_inserted_updates_pyramid(self):
+        aggregate_pyramid = self.geometry.aggregate_pyramid(self.series)
+        index = self.series.insert(date(2022, 9, 27), 200.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertIs(self.geometry.aggregate_pyramid(self.series), aggregate_pyramid)
+        self.assertEqual(aggregate_pyramid.level(subject.pyramid.DAY).counts[-1], 1)
+        self.assertEqual(max(aggregate_pyramid.level(subject.pyramid.MONTH).highs), 200.0)
+
+
+class TestOverlayGeometry(unittest.TestCase):
+    def setUp(self):
+        start = date(2025, 1, 1).toordinal()
+        self.series = subject.TimeSeries(range(start, start + 30), [70.0 + 0.1 * i for i in range(30)])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=300, height=200)
+        self.geometry = subject.ChartGeometry()
+
+    def test_overlays_project_statistics(self):
+        overlays = self.geometry.overlays(self.series, self.area)
+        self.assertEqual(len(overlays[subject.statistics.SMA][0]), 30)
+        self.assertEqual(len(overlays[subject.statistics.EMA][0]), 30)
+        # Datos en línea recta: la tendencia va de esquina a esquina del área
+        xs, ys = overlays[subject.statistics.TREND]
+        self.assertEqual(xs, [100, 400])
+        self.assertAlmostEqual(ys[0], subject.value_to_y(70.0, 80, 200, 70.0, 72.9))
+        self.assertAlmostEqual(ys[1], subject.value_to_y(72.9, 80, 200, 70.0, 72.9))
+
+    def test_overlays_sample_dense_ranges(self):
+        area = subject.PlotArea(margin_left=100, margin_top=80, width=5, height=200)
+        self.assertEqual(len(self.geometry.overlays(self.series, area)[subject.statistics.SMA][0]), 10)
+
+    def test_appended_entry_extends_statistics(self):
+        stats = self.geometry.rolling_statistics(self.series)
+        index = self.series.insert(date(2025, 2, 15), 75.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertIs(self.geometry.rolling_statistics(self.series), stats)
+        self.assertEqual(len(stats), 31)
+        self.assertEqual(len(self.geometry.overlays(self.series, self.area)[subject.statistics.SMA][0]), 31)
+
+    def test_inserted_entry_in_the_middle_rebuilds_statistics(self):
+        stats = self.geometry.rolling_statistics(self.series)
+        index = self.series.insert(date(2025, 1, 10), 90.0)
+        self.geometry.entry_inserted(self.series, index)
+        self.assertIsNot(self.geometry.rolling_statistics(self.series), stats)
+
+
+class TestExtraSeriesGeometry(unittest.TestCase):
+    def setUp(self):
+        self.series = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 70.0),
+            (date(2025, 9, 11), 72.0),
+        ])
+        self.extra = subject.TimeSeries.from_records([
+            (date(2025, 8, 22), 20.0),
+            (date(2025, 9, 6), 25.0),
+            (date(2025, 9, 21), 22.0),
+        ])
+        self.area = subject.PlotArea(margin_left=100, margin_top=80, width=300, height=200)
+        self.geometry = subject.ChartGeometry()
+        self.geometry.set_extra_series([self.extra])
+
+    def test_extents_are_shared(self):
+        extents = self.geometry.extents(self.series)
+        self.assertEqual((extents.min_val, extents.max_val), (20.0, 72.0))
+        self.assertEqual((extents.date_min, extents.date_max), (date(2025, 8, 22), date(2025, 9, 21)))
+        self.assertEqual(
+            self.geometry.bounds(self.series),
+            (date(2025, 8, 22).toordinal(), date(2025, 9, 21).toordinal()),
+        )
+
+    def test_viewport_extents_include_extra_window(self):
+        self.geometry.set_viewport(subject.Viewport(date(2025, 9, 1).toordinal(), date(2025, 9, 11).toordinal()))
+        extents = self.geometry.extents(self.series)
+        self.assertEqual((extents.min_val, extents.max_val), (25.0, 72.0))
+
+    def test_extra_lines_use_shared_axes(self):
+        [((xs, ys), line)] = self.geometry.extra_lines(self.series, self.area, None)
+        self.assertEqual(xs, [100, 250, 400])
+        self.assertEqual(line, (xs, ys))
+        self.assertIs(self.geometry.extra_lines(self.series, self.area, None)[0][1], line)
+
+    def test_set_extra_series_invalidates_view(self):
+        version = self.geometry.data_version
+        self.geometry.extents(self.series)
+        self.geometry.set_extra_series([])
+        self.assertGreater(self.geometry.data_version, version)
+        self.assertEqual(self.geometry.extents(self.series).min_val, 70.0)
+        self.assertEqual(self.geometry.extra_lines(self.series, self.area, None), [])
+
+
+class TestWidgetHover(unittest.TestCase):
+    def setUp(self):
+        self.widget = MagicMock()
+        self.widget._entries = subject.TimeSeries.from_records([
+            (date(2025, 9, 1), 70.0),
+            (date(2025, 9, 11), 72.0),
+        ])
+        self.widget.geometry = subject.ChartGeometry()
+        self.widget.hovered_point = 1
+        self.widget._set_hovered_point = lambda index: subject.TimeSeriesChartWidget._set_hovered_point(self.widget, index)
+
+    def test_insert_entry_before_hover_notifies_new_index(self):
+        subject.TimeSeriesChartWidget.insert_entry(self.widget, subject.TimeSeriesEntry(date(2025, 9, 5), 71.0))
+        self.assertEqual(self.widget.hovered_point, 2)
+        self.widget.emit.assert_called_once_with("hover-changed", 2)
+
+    def test_insert_entry_after_hover_keeps_it(self):
+        subject.TimeSeriesChartWidget.insert_entry(self.widget, subject.TimeSeriesEntry(date(2025, 9, 20), 71.0))
+        self.assertEqual(self.widget.hovered_point, 1)
+        self.widget.emit.assert_not_called()
+
+    def test_insert_entries_clears_hover(self):
+        batch = subject.TimeSeries.from_records([(date(2025, 9, 5), 71.0)])
+        subject.TimeSeriesChartWidget.insert_entries(self.widget, batch)
+        self.assertIsNone(self.widget.hovered_point)
+        self.widget.emit.assert_called_once_with("hover-changed", -1)
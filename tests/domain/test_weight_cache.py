@@ -0,0 +1,163 @@
+import datetime
+import os
+import pytest
+from health_control_chackra.domain import weight_cache as subject
+from health_control_chackra.domain import weight_repository
+
+
+def _write_csv(path, rows):
+    path.write_text("date,weight\n" + "".join(f"{date},{weight}\n" for date, weight in rows))
+
+
+def _columns(path):
+    return weight_repository.FileCsvWeightRepository(path).read_columns()
+
+
+@pytest.unittests
+def test_weightcache_save_and_load_roundtrip(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70), ("2025-09-02", 72.5), ("2025-09-03", 71)])
+    cache = subject.WeightCache(file_path)
+    columns = subject.WeightColumns()
+    columns.extend([(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 2), 72.5), (datetime.date(2025, 9, 3), 71.0)])
+
+    cache.save(columns, os.stat(file_path))
+    header = cache.read_header()
+
+    assert header is not None
+    assert header.count == 3
+    assert cache.status(header, os.stat(file_path)) == subject.FRESH
+    assert cache.load(header) == columns
+
+
+@pytest.unittests
+def test_weightcache_missing_or_corrupt_is_stale(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70)])
+    cache = subject.WeightCache(file_path)
+
+    assert cache.read_header() is None
+    assert cache.status(None, os.stat(file_path)) == subject.STALE
+
+    cache.path.write_bytes(b"garbage")
+    assert cache.read_header() is None
+
+
+@pytest.unittests
+def test_weightcolumns_sorted_reorders_values():
+    columns = subject.WeightColumns()
+    columns.extend([(datetime.date(2025, 9, 3), 3.0), (datetime.date(2025, 9, 1), 1.0), (datetime.date(2025, 9, 2), 2.0)])
+
+    result = columns.sorted()
+
+    assert list(result.values) == [1.0, 2.0, 3.0]
+    assert list(result.ordinals) == sorted(columns.ordinals)
+
+
+@pytest.unittests
+def test_repository_read_columns_writes_and_reuses_cache(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-02", 72), ("2025-09-01", 70)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+
+    assert repository.cache_status() == subject.STALE
+    first = repository.read_columns()
+
+    assert list(first.values) == [70.0, 72.0]
+    assert repository.cache.exists()
+    assert repository.cache_status() == subject.FRESH
+    assert _columns(file_path) == first
+
+
+@pytest.unittests
+def test_repository_read_columns_parses_only_appended_rows(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70), ("2025-09-03", 73)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+    repository.read_columns()
+
+    repository.insert(weight=71.5, date=datetime.date(2025, 9, 2))
+
+    assert repository.cache_status() == subject.APPENDED
+    columns = repository.read_columns()
+    assert list(columns.values) == [70.0, 71.5, 73.0]
+    assert repository.cache_status() == subject.FRESH
+
+
+@pytest.unittests
+def test_repository_read_columns_rebuilds_after_rewrite(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70), ("2025-09-02", 72)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+    repository.read_columns()
+
+    _write_csv(file_path, [("2025-09-01", 60), ("2025-09-02", 62)])
+
+    assert repository.cache_status() == subject.STALE
+    assert list(repository.read_columns().values) == [60.0, 62.0]
+
+
+@pytest.unittests
+def test_repository_read_columns_rebuilds_after_same_size_edit(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    start = datetime.date(2000, 1, 1)
+    _write_csv(file_path, [(start + datetime.timedelta(days=i), 70.5) for i in range(1000)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+    repository.read_columns()
+    stat = os.stat(file_path)
+
+    # Cambio fuera de la cola que cubre el hash, sin cambiar el tamaño
+    file_path.write_text(file_path.read_text().replace("2000-01-01,70.5", "2000-01-01,99.5", 1))
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert repository.cache_status() == subject.STALE
+    assert repository.read_columns().values[0] == 99.5
+    assert repository.map_columns().values[0] == 99.5
+    assert repository.cache_status() == subject.FRESH
+
+
+@pytest.unittests
+def test_repository_iter_chunks_populates_cache(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70), ("2025-09-02", 72)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+
+    list(repository.iter_chunks(chunk_size=1))
+
+    assert repository.cache_status() == subject.FRESH
+
+
+@pytest.unittests
+def test_repository_without_cache_never_writes_sidecar(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70)])
+    repository = weight_repository.FileCsvWeightRepository(file_path, use_cache=False)
+
+    assert list(repository.read_columns().values) == [70.0]
+    assert not subject.WeightCache(file_path).exists()
+
+
+@pytest.unittests
+def test_repository_map_columns_returns_zero_copy_views(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70), ("2025-09-02", 72.5)])
+    repository = weight_repository.FileCsvWeightRepository(file_path)
+
+    columns = repository.map_columns()
+
+    assert isinstance(columns.values, memoryview)
+    assert columns.values.readonly
+    assert list(columns.ordinals) == [datetime.date(2025, 9, 1).toordinal(), datetime.date(2025, 9, 2).toordinal()]
+    assert list(columns.values) == [70.0, 72.5]
+
+
+@pytest.unittests
+def test_repository_map_columns_falls_back_without_cache(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    _write_csv(file_path, [("2025-09-01", 70)])
+    repository = weight_repository.FileCsvWeightRepository(file_path, use_cache=False)
+
+    columns = repository.map_columns()
+
+    assert not isinstance(columns.values, memoryview)
+    assert list(columns.values) == [70.0]
@@ -1,5 +1,8 @@
+import contextlib
 import pathlib
 import datetime
+import os
+import sqlite3
 import pytest
 from health_control_chackra.domain import weight_repository as subject
 
@@ -75,4 +78,393 @@ def test_filecsvweightrepository_insert_append_to_existing_file(tmp_path):
     with open(file_path, "r") as f:
         content = f.read()
 
-    assert content == "date,weight\n2025-09-01,68.5\n2025-09-02,72.0\n"
\ No newline at end of file
+    assert content == "date,weight\n2025-09-01,68.5\n2025-09-02,72.0\n"
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_records_yields_typed_values(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n2025-09-02,72.5\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    result = list(repository.iter_records())
+
+    assert result == [(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 2), 72.5)]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_records_skips_invalid_rows(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\nnot-a-date,71\n2025-09-03,heavy\n2025-09-04,73\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    result = list(repository.iter_records())
+
+    assert result == [(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 4), 73.0)]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_chunks(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    rows = "".join(f"2025-09-{day:02d},{60 + day}\n" for day in range(1, 8))
+    file_path.write_text("date,weight\n" + rows)
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    chunks = list(repository.iter_chunks(chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[-1] == [(datetime.date(2025, 9, 7), 67.0)]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_chunks_with_empty_file(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    assert list(repository.iter_chunks()) == []
+
+
+@pytest.unittests
+def test_parse_weight_lines_fast_path():
+    errors = subject.ParseErrors()
+
+    result = list(subject.parse_weight_lines(["2025-09-01,70\n", "2025-09-02,72.5\r\n"], errors))
+
+    assert result == [(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 2), 72.5)]
+    assert errors.count == 0
+
+
+@pytest.unittests
+def test_parse_weight_lines_falls_back_for_quoted_and_loose_rows():
+    errors = subject.ParseErrors()
+    lines = ['"2025-09-01","70"\n', " 2025-09-02 , 71\n", "2025-9-3,72\n", "\n"]
+
+    result = list(subject.parse_weight_lines(lines, errors))
+
+    assert result == [
+        (datetime.date(2025, 9, 1), 70.0),
+        (datetime.date(2025, 9, 2), 71.0),
+        (datetime.date(2025, 9, 3), 72.0),
+    ]
+    assert errors.count == 0
+
+
+@pytest.unittests
+def test_parse_weight_lines_collects_errors_in_bulk():
+    errors = subject.ParseErrors()
+    lines = ["bad,row\n"] * 10 + ["2025-09-01,70\n"]
+
+    result = list(subject.parse_weight_lines(lines, errors))
+
+    assert result == [(datetime.date(2025, 9, 1), 70.0)]
+    assert errors.count == 10
+    assert len(errors.samples) == subject.MAX_ERROR_SAMPLES
+    assert errors.samples[0] == (2, "bad,row")
+
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_records_with_reordered_header(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("weight,date\n70,2025-09-01\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    assert list(repository.iter_records()) == [(datetime.date(2025, 9, 1), 70.0)]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_iter_records_reports_errors(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\nbad,row\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+    errors = subject.ParseErrors()
+
+    result = list(repository.iter_records(errors))
+
+    assert result == [(datetime.date(2025, 9, 1), 70.0)]
+    assert errors.samples == [(3, "bad,row")]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_get_range_count_and_extents(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-03,73\n2025-09-01,70\n2025-09-02,75.5\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    assert repository.count() == 3
+    assert repository.get_range(datetime.date(2025, 9, 2), datetime.date(2025, 9, 3)) == [
+        (datetime.date(2025, 9, 2), 75.5),
+        (datetime.date(2025, 9, 3), 73.0),
+    ]
+    assert repository.extents() == subject.WeightExtents(
+        date_min=datetime.date(2025, 9, 1),
+        date_max=datetime.date(2025, 9, 3),
+        weight_min=70.0,
+        weight_max=75.5,
+    )
+
+
+@pytest.unittests
+def test_filecsvweightrepository_extents_empty(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    assert repository.count() == 0
+    assert repository.extents() is None
+    assert repository.get_range(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31)) == []
+
+
+@pytest.unittests
+def test_sqliteweightrepository_insert_and_query(tmp_path):
+    repository = subject.SqliteWeightRepository(tmp_path / "weights.db")
+    repository.insert_many([
+        (datetime.date(2025, 9, 3), 73),
+        (datetime.date(2025, 9, 1), 70),
+    ])
+    repository.insert(weight=75.5, date=datetime.date(2025, 9, 2))
+
+    assert repository.exists() is True
+    assert repository.count() == 3
+    assert repository.get_range(datetime.date(2025, 9, 1), datetime.date(2025, 9, 2)) == [
+        (datetime.date(2025, 9, 1), 70.0),
+        (datetime.date(2025, 9, 2), 75.5),
+    ]
+    assert repository.extents() == subject.WeightExtents(
+        date_min=datetime.date(2025, 9, 1),
+        date_max=datetime.date(2025, 9, 3),
+        weight_min=70.0,
+        weight_max=75.5,
+    )
+    assert [len(chunk) for chunk in repository.iter_chunks(chunk_size=2)] == [2, 1]
+    assert repository.get_all()[0] == {'date': '2025-09-01', 'weight': '70.0'}
+
+
+@pytest.unittests
+def test_sqliteweightrepository_empty(tmp_path):
+    file_path = tmp_path / "weights.sqlite"
+    repository = subject.SqliteWeightRepository(file_path)
+
+    assert repository.has_fast_extents() is False
+    assert repository.count() == 0
+    assert repository.extents() is None
+    assert repository.get_range(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31)) == []
+    assert repository.get_all() == []
+    assert list(repository.iter_chunks()) == []
+    # Leer no debe crear la base
+    assert not file_path.exists()
+
+
+@pytest.unittests
+def test_create_weight_repository_by_suffix(tmp_path):
+    assert isinstance(subject.create_weight_repository(tmp_path / "w.csv"), subject.FileCsvWeightRepository)
+    assert isinstance(subject.create_weight_repository(tmp_path / "w.db"), subject.SqliteWeightRepository)
+    assert isinstance(subject.create_weight_repository(tmp_path / "w.SQLite3"), subject.SqliteWeightRepository)
+
+
+@pytest.unittests
+def test_filecsvweightrepository_insert_many_writes_header_once(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    repository.insert_many([(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 2), 71.5)])
+    repository.insert_many([(datetime.date(2025, 9, 3), 72.0)])
+
+    assert file_path.read_text() == "date,weight\n2025-09-01,70.0\n2025-09-02,71.5\n2025-09-03,72.0\n"
+
+
+@pytest.unittests
+def test_csvweightwriter_batches_until_flush(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    repository = subject.FileCsvWeightRepository(file_path)
+
+    with repository.writer(batch_size=2, fsync=subject.FSYNC_NEVER) as writer:
+        writer.write(datetime.date(2025, 9, 1), 70.0)
+        assert not file_path.exists()
+        writer.write(datetime.date(2025, 9, 2), 71.0)
+        assert file_path.read_text() == "date,weight\n2025-09-01,70.0\n2025-09-02,71.0\n"
+        writer.write(datetime.date(2025, 9, 3), 72.0)
+        assert writer.pending == [(datetime.date(2025, 9, 3), 72.0)]
+
+    assert file_path.read_text().endswith("2025-09-03,72.0\n")
+    assert [value for _, value in repository.get_range(datetime.date(2025, 9, 1), datetime.date(2025, 9, 3))] == [70.0, 71.0, 72.0]
+
+
+@pytest.unittests
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+def test_csvweightwriter_keeps_rows_when_write_fails(tmp_path, monkeypatch):
+    file_path = tmp_path / "weights.csv"
+    repository = subject.FileCsvWeightRepository(file_path)
+    writer = repository.writer(fsync=subject.FSYNC_NEVER)
+    open_for_append = repository.open_for_append
+
+    def fail_once():
+        # /dev/full acepta la apertura y falla con ENOSPC al volcar el búfer
+        monkeypatch.setattr(repository, "open_for_append", open_for_append)
+        return open("/dev/full", "a", newline="")
+
+    monkeypatch.setattr(repository, "open_for_append", fail_once)
+    writer.write(datetime.date(2025, 9, 1), 70.0)
+
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.pending == [(datetime.date(2025, 9, 1), 70.0)]
+
+    writer.close()
+
+    assert file_path.read_text() == "date,weight\n2025-09-01,70.0\n"
+    assert writer.pending == []
+
+
+@pytest.unittests
+def test_weightwriter_uses_insert_many_for_sqlite(tmp_path):
+    repository = subject.SqliteWeightRepository(tmp_path / "weights.db")
+
+    with repository.writer() as writer:
+        writer.write(datetime.date(2025, 9, 1), 70.0)
+        writer.write(datetime.date(2025, 9, 2), 71.0)
+        assert repository.count() == 0
+
+    assert repository.count() == 2
+
+
+@pytest.unittests
+def test_cachedweightrepository_reuses_columns_until_file_changes(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n2025-09-02,72\n")
+    repository = subject.CachedWeightRepository(subject.FileCsvWeightRepository(file_path))
+
+    first = repository.read_columns()
+
+    assert first.values.readonly
+    assert repository.read_columns() is first
+    assert repository.can_read_columns_fast() is True
+
+    file_path.write_text("date,weight\n2025-09-01,60\n")
+
+    assert list(repository.read_columns().values) == [60.0]
+
+
+@pytest.unittests
+def test_cachedweightrepository_insert_invalidates(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n")
+    repository = subject.CachedWeightRepository(subject.FileCsvWeightRepository(file_path))
+    assert repository.count() == 1
+    repository.read_columns()
+
+    repository.insert(weight=71.0, date=datetime.date(2025, 9, 2))
+
+    assert repository.count() == 2
+    assert repository.extents().weight_max == 71.0
+
+
+@pytest.unittests
+def test_cachedweightrepository_iter_chunks_fills_cache(tmp_path):
+    repository = subject.CachedWeightRepository(subject.SqliteWeightRepository(tmp_path / "weights.db"))
+    repository.insert_many([(datetime.date(2025, 9, 2), 72.0), (datetime.date(2025, 9, 1), 70.0)])
+
+    assert repository.can_read_columns_fast() is False
+    assert [record for chunk in repository.iter_chunks(chunk_size=1) for record in chunk] == [
+        (datetime.date(2025, 9, 1), 70.0),
+        (datetime.date(2025, 9, 2), 72.0),
+    ]
+    assert repository.can_read_columns_fast() is True
+    assert repository.get_range(datetime.date(2025, 9, 2), datetime.date(2025, 9, 2)) == [(datetime.date(2025, 9, 2), 72.0)]
+
+    with repository.writer() as writer:
+        writer.write(datetime.date(2025, 9, 3), 73.0)
+
+    assert repository.can_read_columns_fast() is False
+    assert repository.count() == 3
+
+
+@pytest.unittests
+def test_cachedweightrepository_iter_chunks_shares_columns_with_sidecar(tmp_path, monkeypatch):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n2025-09-02,72\n2025-09-03,71\n")
+    backend = subject.FileCsvWeightRepository(file_path)
+    repository = subject.CachedWeightRepository(backend)
+    saved = []
+    save_cache = backend._save_cache
+    monkeypatch.setattr(backend, "_save_cache", lambda columns, stat: (saved.append(columns), save_cache(columns, stat)))
+
+    assert sum(len(chunk) for chunk in repository.iter_chunks(chunk_size=2)) == 3
+
+    columns = repository.read_columns()
+    assert backend.cache_status() == "fresh"
+    assert list(columns.values) == [70.0, 72.0, 71.0]
+    assert columns.ordinals.obj is saved[0].ordinals
+    assert columns.values.obj is saved[0].values
+
+
+@pytest.unittests
+def test_cached_weight_repository_is_shared_per_path(tmp_path):
+    file_path = tmp_path / "weights.csv"
+
+    assert subject.cached_weight_repository(file_path) is subject.cached_weight_repository(file_path)
+
+
+@pytest.unittests
+def test_filecsvweightrepository_read_since_returns_appended_rows(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+    position = repository.position()
+
+    with open(file_path, "a") as f:
+        f.write("2025-09-02,71\n2025-09-03,7")
+    records, position = repository.read_since(position)
+
+    assert records == [(datetime.date(2025, 9, 2), 71.0)]
+    assert position.offset == len("date,weight\n2025-09-01,70\n2025-09-02,71\n")
+
+    with open(file_path, "a") as f:
+        f.write("2\n")
+    records, _ = repository.read_since(position)
+
+    assert records == [(datetime.date(2025, 9, 3), 72.0)]
+
+
+@pytest.unittests
+def test_filecsvweightrepository_read_since_detects_rewrite(tmp_path):
+    file_path = tmp_path / "weights.csv"
+    file_path.write_text("date,weight\n2025-09-01,70\n")
+    repository = subject.FileCsvWeightRepository(file_path)
+    position = repository.position()
+
+    file_path.write_text("date,weight\n2025-09-01,60\n2025-09-02,61\n")
+    assert repository.read_since(position) is None
+
+    file_path.write_text("date,weight\n")
+    assert repository.read_since(position) is None
+
+
+@pytest.unittests
+def test_sqliteweightrepository_read_since_returns_new_rows(tmp_path):
+    repository = subject.SqliteWeightRepository(tmp_path / "weights.db")
+    repository.insert(weight=70.0, date=datetime.date(2025, 9, 2))
+    position = repository.position()
+
+    assert repository.read_since(position) == ([], position)
+
+    with repository.writer() as writer:
+        writer.write(datetime.date(2025, 9, 1), 69.5)
+        writer.write(datetime.date(2025, 9, 3), 71.0)
+    records, position = repository.read_since(position)
+
+    assert records == [(datetime.date(2025, 9, 1), 69.5), (datetime.date(2025, 9, 3), 71.0)]
+    assert position == repository.position()
+
+
+@pytest.unittests
+def test_sqliteweightrepository_read_since_detects_deletions(tmp_path):
+    file_path = tmp_path / "weights.db"
+    repository = subject.SqliteWeightRepository(file_path)
+    repository.insert_many([(datetime.date(2025, 9, 1), 70.0), (datetime.date(2025, 9, 2), 71.0)])
+    position = repository.position()
+
+    with contextlib.closing(sqlite3.connect(file_path)) as connection, connection:
+        connection.execute("DELETE FROM weights WHERE weight = 70.0")
+    repository.insert(weight=72.0, date=datetime.date(2025, 9, 3))
+
+    assert repository.read_since(position) is None
@@ -0,0 +1,37 @@
+import unittest
+from health_control_chackra import startup as subject
+
+
+class TestStartupProfile(unittest.TestCase):
+    def setUp(self):
+        self.profile = subject.StartupProfile(budget_ms=100.0, origin=0.0)
+        self.profile.marks = [("import gi, Adw (20.0 ms)", 20.0), ("window created", 60.0)]
+
+    def test_first_frame_missing(self):
+        self.assertIsNone(self.profile.first_frame_ms())
+        self.assertFalse(self.profile.within_budget())
+        self.assertIn("first frame not reached", self.profile.report())
+
+    def test_within_budget(self):
+        self.profile.marks.append((subject.FIRST_FRAME, 90.0))
+        self.assertEqual(self.profile.first_frame_ms(), 90.0)
+        self.assertTrue(self.profile.within_budget())
+        self.assertIn("[OK]", self.profile.report())
+
+    def test_over_budget(self):
+        self.profile.marks.append((subject.FIRST_FRAME, 150.0))
+        self.assertFalse(self.profile.within_budget())
+        self.assertIn("OVER BUDGET", self.profile.report())
+
+    def test_measure_records_duration(self):
+        profile = subject.StartupProfile()
+        with profile.measure("step"):
+            pass
+        name, at = profile.marks[0]
+        self.assertTrue(name.startswith("step ("))
+        self.assertGreaterEqual(at, 0.0)
+
+    def test_report_lists_deltas(self):
+        report = self.profile.report().splitlines()
+        self.assertIn("(+  40.0)", report[2])
+        self.assertTrue(report[2].endswith("window created"))
@@ -0,0 +1,99 @@
+import collections
+import pathlib
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+import gi  # type: ignore
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from health_control_chackra.domain import weight_repository  # noqa: E402
+from health_control_chackra.ui import main_window as subject  # noqa: E402
+
+
+class TestSaveWeight(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "weights.csv"
+        self.path.write_text("date,weight\n2025-01-01,70.0\n")
+        weight_repository.cached_weight_repository.cache_clear()
+        # Ventana sin widgets reales: solo el estado que usan load_data_from_path y save_weight
+        self.window = MagicMock()
+        self.window.writer = None
+        self.window.current_file_path = None
+        self.window._own_records = collections.Counter()
+        self.window._close_writer = lambda: subject.MainWindow._close_writer(self.window)
+        self.window._flush_source = None
+
+    def tearDown(self):
+        weight_repository.cached_weight_repository.cache_clear()
+        self.directory.cleanup()
+
+    def test_save_weight_while_loading_is_written(self):
+        with patch.object(subject.threading, "Thread") as thread:
+            subject.MainWindow.load_data_from_path(self.window, self.path)
+        thread.return_value.start.assert_called_once()
+        self.assertEqual(self.window.current_file_path, self.path)
+
+        # La carga sigue en curso cuando se añade el peso
+        subject.MainWindow.save_weight(self.window, "2025-01-02", 71.5)
+        self.window.chart.insert_entry.assert_called_once()
+        self.window._schedule_flush.assert_called_once()
+        self.window.writer.close()
+
+        self.assertEqual(self.path.read_text(), "date,weight\n2025-01-01,70.0\n2025-01-02,71.5\n")
+        self.assertEqual(self.window._own_records[(date(2025, 1, 2), 71.5)], 1)
+
+    def test_flush_error_keeps_rows_and_retries(self):
+        self.window.writer = MagicMock()
+        self.window.writer.flush.side_effect = OSError("disk full")
+        with self.assertLogs(subject.logger, "ERROR"):
+            result = subject.MainWindow._on_flush_timeout(self.window)
+        self.assertEqual(result, subject.GLib.SOURCE_REMOVE)
+        self.window._schedule_flush.assert_called_once()
+
+    def test_save_weight_without_repository_only_draws(self):
+        self.window.repository = None
+        subject.MainWindow.save_weight(self.window, "2025-01-02", 71.5)
+        self.window.chart.insert_entry.assert_called_once()
+        self.assertIsNone(self.window.writer)
+
+
+class TestLoadWindows(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "weights.db"
+        self.repository = weight_repository.SqliteWeightRepository(self.path)
+        # Tres años de datos: una ventana de 365 días y otra de 730 que llega hasta el principio
+        self.dates = [date(2022, 1, 2), date(2023, 6, 1), date(2024, 6, 1), date(2024, 12, 31)]
+        self.repository.insert_many([(day, 70.0 + i) for i, day in enumerate(self.dates)])
+        self.window = MagicMock()
+        self.window._load_generation = 1
+        self.window._load_windows = lambda *args: subject.MainWindow._load_windows(self.window, *args)
+        self.window._loaded_position = subject.MainWindow._loaded_position
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_range_backend_loads_newest_window_first(self):
+        with patch.object(subject.weight_repository, "CHUNK_SIZE", 2), patch.object(subject.GLib, "idle_add") as idle_add:
+            subject.MainWindow._load_worker(self.window, 1, self.path, self.repository)
+
+        callbacks = [call.args[0] for call in idle_add.call_args_list]
+        self.assertEqual(callbacks[0], self.window._on_extents_loaded)
+        self.assertEqual(callbacks[-1], self.window._on_load_finished)
+        batches = [call.args[2] for call in idle_add.call_args_list if call.args[0] == self.window._on_chunk_loaded]
+        self.assertEqual([[entry.date for entry in batch] for batch in batches], [
+            [date(2024, 6, 1), date(2024, 12, 31)],
+            [date(2022, 1, 2), date(2023, 6, 1)],
+        ])
+        self.assertIsNotNone(idle_add.call_args_list[-1].args[4])
+
+    def test_small_range_backend_streams_chunks(self):
+        with patch.object(subject.GLib, "idle_add") as idle_add:
+            subject.MainWindow._load_worker(self.window, 1, self.path, self.repository)
+
+        self.assertNotIn(self.window._on_chunk_loaded, [call.args[0] for call in idle_add.call_args_list])
+        finished = idle_add.call_args_list[-1].args
+        self.assertEqual(finished[0], self.window._on_load_finished)
+        self.assertEqual(len(finished[3]), len(self.dates))